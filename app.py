@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 from typing import List, Dict, Any
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import matplotlib.pyplot as plt
 
@@ -33,6 +34,7 @@ st.caption(f"🔑 API Key Loaded: {bool(os.getenv('OPENROUTER_API_KEY'))}")
 # ===========================================================
 from services.llm_client import CodeReviewLLM
 from services.pdf_generator import PDFGenerator
+from services.semantic_cache import SemanticReviewCache
 from db.database import DatabaseManager
 
 # ---------------------------------------------------------------------
@@ -102,6 +104,17 @@ else:
     if st.sidebar.button("Logout"):
         do_logout()
 
+# Report history sort options → DatabaseManager sort keys
+SORT_OPTIONS = {
+    "Date (Newest)": "newest",
+    "Date (Oldest)": "oldest",
+    "Filename": "filename",
+    "Relevance": "relevance",
+}
+
+# Reports shown per page in report listings
+PAGE_SIZE = 25
+
 # Convenience vars
 username = st.session_state.username
 is_admin = st.session_state.is_admin
@@ -121,6 +134,37 @@ def init_services():
         st.error(f"❌ Failed to initialize services: {str(e)}")
         return None, None, None
 
+@st.cache_resource
+def init_semantic_cache(_db_manager):
+    """Initialize the optional semantic review cache (None when unavailable)"""
+    try:
+        return SemanticReviewCache(_db_manager)
+    except Exception:
+        return None
+
+# ---------------------------------------------------------------------
+# 🗃️ Cached Report Queries
+# ---------------------------------------------------------------------
+# Keyed on DatabaseManager.data_version, which every write bumps, so reruns
+# (typing, sorting, paging back) reuse results until the reports change.
+# The leading underscore keeps Streamlit from hashing the manager itself.
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_reports_count(_db_manager, data_version, username, search_term):
+    """Count reports, optionally for one user and/or matching a search term"""
+    return _db_manager.get_reports_count(username=username, search_term=search_term)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_reports(_db_manager, data_version, username, search_term, sort_by, limit, offset):
+    """Fetch one page of reports, optionally for one user and/or matching a search term"""
+    if search_term:
+        return _db_manager.search_reports(
+            search_term, username=username, sort_by=sort_by, limit=limit, offset=offset
+        )
+    if username:
+        return _db_manager.get_reports_for_user(username, sort_by=sort_by, limit=limit, offset=offset)
+    return _db_manager.get_all_reports(limit=limit, offset=offset, sort_by=sort_by)
+
 # ---------------------------------------------------------------------
 # 📊 Complexity Graph
 # ---------------------------------------------------------------------
@@ -164,15 +208,18 @@ def main():
 # ---------------------------------------------------------------------
 def admin_dashboard(db_manager):
     st.header("📊 All Reports (Admin View)")
-    reports = db_manager.get_all_reports()
-    if not reports:
+    version = db_manager.data_version
+    if not cached_reports_count(db_manager, version, None, ""):
         st.info("📭 No reports found yet.")
         return
-    search_term = st.text_input("🔍 Search by username, file, or date")
-    if search_term:
-        reports = [r for r in reports if search_term.lower() in str(r).lower()]
-    st.write(f"Showing {len(reports)} reports.")
-    display_reports(reports)
+    search_term = st.text_input("🔍 Search by username, file, date, or review text").strip()
+
+    # Filter and page in SQL rather than stringifying every report in Python
+    total = cached_reports_count(db_manager, version, None, search_term)
+    offset = select_page(total, key="admin_page") * PAGE_SIZE
+    reports = cached_reports(db_manager, version, None, search_term, "newest", PAGE_SIZE, offset)
+    st.write(f"Showing {len(reports)} of {total} reports.")
+    display_reports(reports, total=total)
 
 # ---------------------------------------------------------------------
 # 👤 User Dashboard
@@ -208,6 +255,30 @@ def upload_and_review_tab(username, llm_client, pdf_generator, db_manager):
         if st.button("🚀 Start Code Review", type="primary", use_container_width=True):
             process_code_review(username, uploaded_files, llm_client, pdf_generator, db_manager)
 
+# ---------------------------------------------------------------------
+# 📝 File Reading
+# ---------------------------------------------------------------------
+def _read_uploaded_file(file) -> Dict[str, Any]:
+    """Read and decode one uploaded file"""
+    # Decode straight from the upload's buffer: no intermediate bytes copy, and
+    # unlike read() it does not depend on (or move) the stream position on reruns
+    with file.getbuffer() as buffer:
+        content = str(buffer, "utf-8", errors="replace")
+    return {
+        "name": file.name,
+        "content": content,
+        "size": file.size,
+        "type": file.type
+    }
+
+
+def read_uploaded_files(uploaded_files) -> List[Dict[str, Any]]:
+    """Read all uploaded files concurrently, keeping upload order"""
+    with ThreadPoolExecutor(max_workers=min(16, len(uploaded_files))) as executor:
+        # Submit every read before collecting so the decodes overlap
+        futures = [executor.submit(_read_uploaded_file, file) for file in uploaded_files]
+        return [future.result() for future in futures]
+
 # ---------------------------------------------------------------------
 # 🤖 Code Review Processing
 # ---------------------------------------------------------------------
@@ -218,22 +289,33 @@ def process_code_review(username, uploaded_files, llm_client, pdf_generator, db_
 
         status_text.text("📝 Reading files...")
         progress_bar.progress(20)
-        file_contents = []
-        for file in uploaded_files:
-            content = file.read().decode("utf-8")
-            file_contents.append({
-                "name": file.name,
-                "content": content,
-                "size": file.size,
-                "type": file.type
-            })
-
-        status_text.text("🤖 Generating AI-powered review...")
-        progress_bar.progress(50)
-        review_result = llm_client.review_code(file_contents)
-        if not review_result["success"]:
-            st.error(f"❌ LLM Review failed: {review_result['error']}")
-            return
+        file_contents = read_uploaded_files(uploaded_files)
+
+        # Identical files reviewed before (same model) reuse the stored review,
+        # falling back to the nearest near-duplicate when the semantic cache is available
+        content_hash = llm_client.cache_key(file_contents)
+        cached = db_manager.get_cached_review(content_hash)
+        embedding = None
+        semantic_cache = init_semantic_cache(db_manager)
+        if not cached and semantic_cache:
+            embedding = semantic_cache.embed(file_contents)
+            cached = semantic_cache.find_similar(embedding, llm_client.model)
+        if cached:
+            status_text.text("♻️ Reusing the review of identical files...")
+            progress_bar.progress(50)
+            review_result = {
+                "success": True,
+                "review": cached["review_content"],
+                "metadata": {**cached["metadata"], "cache_hit": True},
+                "error": None
+            }
+        else:
+            status_text.text("🤖 Generating AI-powered review...")
+            progress_bar.progress(50)
+            review_result = llm_client.review_code_parallel(file_contents)
+            if not review_result["success"]:
+                st.error(f"❌ LLM Review failed: {review_result['error']}")
+                return
 
         status_text.text("📄 Generating PDF report...")
         progress_bar.progress(80)
@@ -243,13 +325,21 @@ def process_code_review(username, uploaded_files, llm_client, pdf_generator, db_
             review_result.get("metadata", {})
         )
 
+        # A review with failed files holds "Review failed" sections; keep it out of the
+        # review cache so the next identical upload asks the model again
+        if review_result.get("metadata", {}).get("failed_files"):
+            content_hash = None
+            embedding = None
+
         status_text.text("💾 Saving report...")
         report_id = db_manager.save_report(
             username=username,
             files=[f["name"] for f in file_contents],
             pdf_path=pdf_path,
             review_content=review_result["review"],
-            metadata=review_result.get("metadata", {})
+            metadata=review_result.get("metadata", {}),
+            content_hash=content_hash,
+            embedding=embedding
         )
 
         progress_bar.progress(100)
@@ -271,15 +361,15 @@ def display_review_results(review_content, pdf_path, report_id):
         st.markdown(review_content)
     with col2:
         st.subheader("📥 Download Report")
-        if os.path.exists(pdf_path):
-            with open(pdf_path, "rb") as pdf_file:
-                st.download_button(
-                    label="📄 Download PDF Report",
-                    data=pdf_file.read(),
-                    file_name=f"code_review_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+        pdf_bytes = read_pdf(pdf_path)
+        if pdf_bytes is not None:
+            st.download_button(
+                label="📄 Download PDF Report",
+                data=pdf_bytes,
+                file_name=f"code_review_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
         if st.button("🔄 Re-run Analysis", use_container_width=True):
             st.rerun()
 
@@ -288,35 +378,32 @@ def display_review_results(review_content, pdf_path, report_id):
 # ---------------------------------------------------------------------
 def reports_history_tab(username, db_manager, pdf_generator):
     st.header("📜 My Past Reviews")
-    reports = db_manager.get_reports_for_user(username)
-    if not reports:
-        st.info("📭 No reports found. Try uploading your first code review!")
-        return
 
     col1, col2 = st.columns([3, 1])
     with col1:
-        search_term = st.text_input("🔍 Search reports")
+        search_term = st.text_input("🔍 Search reports").strip()
     with col2:
-        sort_option = st.selectbox("Sort by", ["Date (Newest)", "Date (Oldest)", "Filename"])
+        sort_option = st.selectbox("Sort by", list(SORT_OPTIONS))
 
-    filtered_reports = reports
-    if search_term:
-        filtered_reports = [r for r in reports if search_term.lower() in r["files"].lower()]
+    # Filtering, sorting and paging happen in SQL (full-text index + ORDER BY + LIMIT/OFFSET)
+    sort_by = SORT_OPTIONS[sort_option]
+    version = db_manager.data_version
+    total = cached_reports_count(db_manager, version, username, search_term)
+    if not total and not search_term:
+        st.info("📭 No reports found. Try uploading your first code review!")
+        return
 
-    if sort_option == "Date (Newest)":
-        filtered_reports.sort(key=lambda x: x["created_at"], reverse=True)
-    elif sort_option == "Date (Oldest)":
-        filtered_reports.sort(key=lambda x: x["created_at"])
-    elif sort_option == "Filename":
-        filtered_reports.sort(key=lambda x: x["files"])
+    offset = select_page(total, key="history_page") * PAGE_SIZE
+    reports = cached_reports(db_manager, version, username, search_term, sort_by, PAGE_SIZE, offset)
 
-    display_reports(filtered_reports)
+    display_reports(reports, total=total)
 
 # ---------------------------------------------------------------------
 # 🧱 Helper Function — Display Reports
 # ---------------------------------------------------------------------
-def display_reports(reports):
-    st.subheader(f"📋 Found {len(reports)} report(s)")
+def display_reports(reports, total=None):
+    st.subheader(f"📋 Found {len(reports) if total is None else total} report(s)")
+    available = existing_pdfs(reports)
     for report in reports:
         with st.expander(f"📄 {report['files']} — {report['created_at']}", expanded=False):
             col1, col2 = st.columns([3, 1])
@@ -326,22 +413,66 @@ def display_reports(reports):
                 st.write(f"🕒 **Created:** {report['created_at']}")
                 st.write(f"🆔 **Report ID:** {report['id']}")
             with col2:
-                if os.path.exists(report["pdf_path"]):
-                    with open(report["pdf_path"], "rb") as pdf_file:
+                # Only read the PDF once the user asks for it, not for every listed report
+                pdf_entry = available.get(report["pdf_path"])
+                if pdf_entry is None:
+                    st.warning("⚠️ PDF not found")
+                elif st.button("📥 Prepare download", key=f"prepare_{report['id']}"):
+                    pdf_bytes = read_pdf(pdf_entry.path)
+                    if pdf_bytes is not None:
                         st.download_button(
                             label="📄 Download PDF",
-                            data=pdf_file.read(),
+                            data=pdf_bytes,
                             file_name=f"report_{report['id']}.pdf",
                             mime="application/pdf",
                             key=f"download_{report['id']}"
                         )
-                else:
-                    st.warning("⚠️ PDF not found")
+                    else:
+                        st.warning("⚠️ PDF not found")
 
-            if report.get("review_content"):
+            if report.get("review_preview"):
                 st.markdown("**Preview:**")
-                preview = report["review_content"][:500] + "..." if len(report["review_content"]) > 500 else report["review_content"]
-                st.markdown(preview)
+                st.markdown(report["review_preview"])
+
+def select_page(total, key):
+    """Render a page picker for `total` reports and return the zero-based page index"""
+    page_count = max(1, -(-total // PAGE_SIZE))
+    if page_count == 1:
+        return 0
+    page = st.number_input(
+        f"Page (1–{page_count})", min_value=1, max_value=page_count, value=1, step=1, key=key
+    )
+    return int(page) - 1
+
+
+def existing_pdfs(reports):
+    """Map each report's pdf_path to its DirEntry, scanning every PDF directory once"""
+    paths_by_dir = {}
+    for report in reports:
+        if report.get("pdf_path"):
+            paths_by_dir.setdefault(os.path.dirname(report["pdf_path"]) or ".", []).append(report["pdf_path"])
+
+    available = {}
+    for directory, paths in paths_by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                present = {entry.name: entry for entry in entries if entry.is_file()}
+        except OSError:
+            continue
+        for path in paths:
+            entry = present.get(os.path.basename(path))
+            if entry is not None:
+                available[path] = entry
+    return available
+
+
+def read_pdf(pdf_path):
+    """Read a report PDF, or return None if it is missing"""
+    try:
+        with open(pdf_path, "rb") as pdf_file:
+            return pdf_file.read()
+    except FileNotFoundError:
+        return None
 
 # ---------------------------------------------------------------------
 # 🏁 Entry Point
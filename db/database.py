@@ -6,24 +6,651 @@ Handles SQLite database operations for storing report metadata and content
 import sqlite3
 import os
 import json
+import threading
+import itertools
+import queue
+import re
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
+import time
 import uuid
+import zlib
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(value: Any) -> str:
+        # Metadata stays TEXT rather than BLOB so json_extract() keeps working on it
+        return orjson.dumps(value).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+
+# Review bodies live in compressed files beside the database; zstd when installed, else zlib.
+# The suffix records the codec, so files stay readable whichever one wrote them
+try:
+    import zstandard
+    _REVIEW_SUFFIX = ".md.zst"
+except ImportError:
+    zstandard = None
+    _REVIEW_SUFFIX = ".md.z"
+
+# Applied in order to the long-lived connection; override per instance via DatabaseManager(pragmas=...)
+DEFAULT_PRAGMAS = {
+    # Only takes effect on a brand-new database, so it must run before anything creates a page
+    "page_size": 8192,
+    # WAL lets readers run alongside a writer; NORMAL syncs only at checkpoints
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -65536,
+    # Serve reads from memory-mapped pages instead of read(2) calls
+    "mmap_size": 268435456,
+    "cache_spill": 0,
+}
+
+# Read-only connections kept open alongside the writer; WAL lets them run while it commits
+READER_POOL_SIZE = 4
+
+# Stored in the database file itself, so only the connection that creates/opens it first needs them
+_DATABASE_PRAGMAS = ("page_size", "journal_mode")
+
+# Search terms that look like the start of a created_at timestamp ("2025", "2025-10-12 14:3")
+_DATE_TERM_RE = re.compile(r"\d{4}(-\d{1,2}(-\d{1,2}([ T]\d{1,2}(:\d{1,2}){0,2})?)?)?")
+
+
+# Bump when adding a migration step; PRAGMA user_version records what a database has applied
+SCHEMA_VERSION = 10
+
+# Keep reports_fts in step with reports (recreated whenever the reports table is rebuilt)
+_FTS_TRIGGERS = '''
+    CREATE TRIGGER IF NOT EXISTS reports_fts_insert AFTER INSERT ON reports BEGIN
+        INSERT INTO reports_fts(rowid, username, files, review_content)
+        VALUES (new.rowid, new.username, new.files, new.review_content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS reports_fts_delete AFTER DELETE ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, username, files, review_content)
+        VALUES ('delete', old.rowid, old.username, old.files, old.review_content);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS reports_fts_update AFTER UPDATE ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, username, files, review_content)
+        VALUES ('delete', old.rowid, old.username, old.files, old.review_content);
+        INSERT INTO reports_fts(rowid, username, files, review_content)
+        VALUES (new.rowid, new.username, new.files, new.review_content);
+    END;
+'''
+
+# Base schema: reports table, lookup indexes and the trigger-synced full-text index
+_SCHEMA_V1 = f'''
+    BEGIN;
+
+    CREATE TABLE IF NOT EXISTS reports (
+        id TEXT PRIMARY KEY,
+        username TEXT NOT NULL,
+        files TEXT NOT NULL,
+        pdf_path TEXT NOT NULL,
+        review_content TEXT NOT NULL,
+        metadata TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports(created_at);
+    CREATE INDEX IF NOT EXISTS idx_reports_files ON reports(files);
+    CREATE INDEX IF NOT EXISTS idx_reports_username ON reports(username);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+        username, files, review_content,
+        content='reports', content_rowid='rowid'
+    );
+{_FTS_TRIGGERS}
+    -- Index reports saved before the full-text table existed
+    INSERT INTO reports_fts(reports_fts) VALUES('rebuild');
+
+    PRAGMA user_version = 1;
+
+    COMMIT;
+'''
+
+# Fingerprint of the reviewed input, so identical submissions can reuse a stored review
+_SCHEMA_V2 = '''
+    BEGIN;
+
+    ALTER TABLE reports ADD COLUMN content_hash TEXT;
+    CREATE INDEX IF NOT EXISTS idx_reports_content_hash ON reports(content_hash);
+
+    PRAGMA user_version = 2;
+
+    COMMIT;
+'''
+
+# Normalized float16 embedding of the reviewed input, for the semantic review cache
+_SCHEMA_V3 = '''
+    BEGIN;
+
+    ALTER TABLE reports ADD COLUMN embedding BLOB;
+
+    PRAGMA user_version = 3;
+
+    COMMIT;
+'''
+
+# Rebuild reports around a monotonic INTEGER PRIMARY KEY (the rowid) so inserts append
+# to the B-tree; the UUID stays as the public "id" with its own UNIQUE index
+_SCHEMA_V4 = f'''
+    BEGIN;
+
+    CREATE TABLE reports_new (
+        rowid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        username TEXT NOT NULL,
+        files TEXT NOT NULL,
+        pdf_path TEXT NOT NULL,
+        review_content TEXT NOT NULL,
+        metadata TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        content_hash TEXT,
+        embedding BLOB
+    );
+
+    INSERT INTO reports_new (
+        id, username, files, pdf_path, review_content, metadata,
+        created_at, updated_at, content_hash, embedding
+    )
+    SELECT
+        id, COALESCE(username, 'unknown'), files, pdf_path, review_content, metadata,
+        created_at, updated_at, content_hash, embedding
+    FROM reports ORDER BY created_at, rowid;
+
+    -- Dropping the old table also drops its indexes and triggers
+    DROP TABLE reports;
+    ALTER TABLE reports_new RENAME TO reports;
+
+    CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports(created_at);
+    CREATE INDEX IF NOT EXISTS idx_reports_files ON reports(files);
+    CREATE INDEX IF NOT EXISTS idx_reports_username ON reports(username);
+    CREATE INDEX IF NOT EXISTS idx_reports_content_hash ON reports(content_hash);
+{_FTS_TRIGGERS}
+    -- Rowids were renumbered, so re-index
+    INSERT INTO reports_fts(reports_fts) VALUES('rebuild');
+
+    PRAGMA user_version = 4;
+
+    COMMIT;
+'''
+
+# Re-create the full-text index with stemming and 2/3-character prefix indexes, so
+# "runs" finds "running" and short as-you-type prefixes avoid a full term-list scan
+_SCHEMA_V5 = '''
+    BEGIN;
+
+    DROP TABLE IF EXISTS reports_fts;
+    CREATE VIRTUAL TABLE reports_fts USING fts5(
+        username, files, review_content,
+        content='reports', content_rowid='rowid',
+        tokenize='porter unicode61', prefix='2 3'
+    );
+    INSERT INTO reports_fts(reports_fts) VALUES('rebuild');
+
+    PRAGMA user_version = 5;
+
+    COMMIT;
+'''
+
+# Expose metadata.model_used as an indexed (virtual, so nothing extra is stored per row)
+# generated column, so filtering by model happens in SQL instead of after json.loads.
+# json_valid() guards it: legacy rows may hold metadata that is not JSON at all
+_SCHEMA_V6 = '''
+    BEGIN;
+
+    ALTER TABLE reports ADD COLUMN model_used TEXT
+        GENERATED ALWAYS AS (
+            CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.model_used') END
+        ) VIRTUAL;
+    CREATE INDEX IF NOT EXISTS idx_reports_model_used ON reports(model_used);
+
+    PRAGMA user_version = 6;
+
+    COMMIT;
+'''
+
+# One row per (report, file name), so "reports that touched foo.py" is an index seek rather
+# than a substring match on the comma-joined files column; backfilled by splitting on ", "
+_SCHEMA_V7 = '''
+    BEGIN;
+
+    CREATE TABLE IF NOT EXISTS report_files (
+        report_rowid INTEGER NOT NULL,
+        file_name TEXT NOT NULL,
+        PRIMARY KEY (report_rowid, file_name)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_report_files_name ON report_files(file_name);
+
+    CREATE TRIGGER IF NOT EXISTS report_files_delete AFTER DELETE ON reports BEGIN
+        DELETE FROM report_files WHERE report_rowid = old.rowid;
+    END;
+
+    WITH RECURSIVE split(report_rowid, file_name, rest) AS (
+        SELECT rowid, NULL, files || ', ' FROM reports
+        UNION ALL
+        SELECT report_rowid, substr(rest, 1, instr(rest, ', ') - 1), substr(rest, instr(rest, ', ') + 2)
+        FROM split WHERE rest <> ''
+    )
+    INSERT OR IGNORE INTO report_files (report_rowid, file_name)
+    SELECT report_rowid, file_name FROM split WHERE file_name <> '';
+
+    PRAGMA user_version = 7;
+
+    COMMIT;
+'''
+
+# Listings show a short preview; keeping it in its own column means list queries never
+# have to read review_content (often tens of KB in overflow pages) just to truncate it
+REVIEW_PREVIEW_LENGTH = 500
+
+_SCHEMA_V8 = f'''
+    BEGIN;
+
+    ALTER TABLE reports ADD COLUMN review_preview TEXT;
+    UPDATE reports SET review_preview = CASE
+        WHEN length(review_content) > {REVIEW_PREVIEW_LENGTH}
+        THEN substr(review_content, 1, {REVIEW_PREVIEW_LENGTH}) || '...'
+        ELSE review_content
+    END;
+
+    PRAGMA user_version = 8;
+
+    COMMIT;
+'''
+
+# A user's history is filtered by username and ordered by date; one composite index serves
+# both (and keyset pages), replacing the username-only index it makes redundant
+_SCHEMA_V9 = '''
+    BEGIN;
+
+    CREATE INDEX IF NOT EXISTS idx_reports_username_created_at ON reports(username, created_at);
+    DROP INDEX IF EXISTS idx_reports_username;
+
+    PRAGMA user_version = 9;
+
+    COMMIT;
+'''
+
+# Review bodies move out of the row into compressed files (review_path), so listing scans stop
+# walking overflow pages. The full-text index can no longer read the text from reports, so it
+# becomes a regular FTS5 table that save/update write directly; triggers only follow
+# username/files changes and deletes. Older rows keep their inline review_content.
+_SCHEMA_V10 = '''
+    BEGIN;
+
+    ALTER TABLE reports ADD COLUMN review_path TEXT;
+
+    DROP TRIGGER IF EXISTS reports_fts_insert;
+    DROP TRIGGER IF EXISTS reports_fts_delete;
+    DROP TRIGGER IF EXISTS reports_fts_update;
+    DROP TABLE IF EXISTS reports_fts;
+
+    CREATE VIRTUAL TABLE reports_fts USING fts5(
+        username, files, review_content,
+        tokenize='porter unicode61', prefix='2 3'
+    );
+    INSERT INTO reports_fts(rowid, username, files, review_content)
+    SELECT rowid, username, files, review_content FROM reports;
+
+    CREATE TRIGGER reports_fts_delete AFTER DELETE ON reports BEGIN
+        DELETE FROM reports_fts WHERE rowid = old.rowid;
+    END;
+
+    CREATE TRIGGER reports_fts_update AFTER UPDATE OF username, files ON reports BEGIN
+        UPDATE reports_fts SET username = new.username, files = new.files WHERE rowid = new.rowid;
+    END;
+
+    PRAGMA user_version = 10;
+
+    COMMIT;
+'''
+
+# ORDER BY clauses for the supported sort options (qualified, since search joins reports_fts)
+_ORDER_BY = {
+    # rowid breaks ties between reports saved within the same second
+    "newest": "reports.created_at DESC, reports.rowid DESC",
+    "oldest": "reports.created_at ASC, reports.rowid ASC",
+    "filename": "reports.files ASC",
+    # BM25 rank (lower is better), weighting file-name hits above username/review text
+    "relevance": "bm25(reports_fts, 1.0, 2.0, 1.0)",
+}
+
+
+# -----------------------------------------------------------------------------
+# 🧾 SQL Statements (one literal per query, so each hits the statement cache)
+# -----------------------------------------------------------------------------
+# review_path is resolved into review_content by _row_to_report
+_REPORT_COLUMNS = "id, username, files, pdf_path, review_content, review_path, metadata, created_at, updated_at"
+
+# Listings select the preview instead of the full review unless asked for it
+_LISTING_COLUMNS = "id, username, files, pdf_path, review_preview, metadata, created_at, updated_at"
+
+
+def _qualified(columns: str) -> str:
+    return ", ".join(f"reports.{column.strip()}" for column in columns.split(","))
+
+_SQL_INSERT_REPORT = '''
+    INSERT INTO reports (
+        id, username, files, pdf_path, review_content, review_path, review_preview, metadata,
+        content_hash, embedding
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_FTS = '''
+    INSERT INTO reports_fts (rowid, username, files, review_content)
+    SELECT rowid, username, files, ? FROM reports WHERE id = ?
+'''
+
+_SQL_UPDATE_FTS_REVIEW = '''
+    UPDATE reports_fts SET review_content = ?
+    WHERE rowid = (SELECT rowid FROM reports WHERE id = ?)
+'''
+
+# update_report statements for every combination of updatable fields, keyed by the fields
+# in _UPDATE_FIELDS order; a review_content update also rewrites its path and preview
+_UPDATE_FIELDS = ("username", "files", "pdf_path", "review_content", "metadata")
+_UPDATE_SET_CLAUSES = {
+    "username": "username = ?",
+    "files": "files = ?",
+    "pdf_path": "pdf_path = ?",
+    "review_content": "review_content = ?, review_path = ?, review_preview = ?",
+    "metadata": "metadata = ?",
+}
+_SQL_UPDATE_REPORT = {
+    fields: (
+        f"UPDATE reports SET {', '.join(_UPDATE_SET_CLAUSES[field] for field in fields)}, "
+        "updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    )
+    for size in range(1, len(_UPDATE_FIELDS) + 1)
+    for fields in itertools.combinations(_UPDATE_FIELDS, size)
+}
+
+_SQL_GET_REVIEW_PATH = "SELECT review_path FROM reports WHERE id = ?"
+
+_SQL_INSERT_REPORT_FILE = '''
+    INSERT OR IGNORE INTO report_files (report_rowid, file_name)
+    SELECT rowid, ? FROM reports WHERE id = ?
+'''
+
+_SQL_CLEAR_REPORT_FILES = "DELETE FROM report_files WHERE report_rowid = (SELECT rowid FROM reports WHERE id = ?)"
+
+_SQL_GET_REPORT = f"SELECT {_REPORT_COLUMNS} FROM reports WHERE id = ?"
+
+_SQL_GET_CACHED_REVIEW = '''
+    SELECT review_content, review_path, metadata FROM reports
+    WHERE content_hash = ? ORDER BY created_at DESC LIMIT 1
+'''
+
+_SQL_GET_EMBEDDINGS = '''
+    SELECT id, embedding FROM reports
+    WHERE model_used = ? AND embedding IS NOT NULL
+'''
+
+_SQL_GET_REPORT_CONTENT = "SELECT review_content, review_path FROM reports WHERE id = ?"
+
+# Listing queries are formatted once at import for every (sort option, include_content) pair,
+# so a call is a dict lookup and each variant is one stable string for the statement cache
+def _sql_variants(template: str, searching: bool = False) -> Dict[tuple, str]:
+    columns = {False: _LISTING_COLUMNS, True: _REPORT_COLUMNS}
+    return {
+        (sort_by, include_content): template.format(
+            columns=_qualified(columns[include_content]) if searching else columns[include_content],
+            order_by=order_by,
+        )
+        for sort_by, order_by in _ORDER_BY.items()
+        # bm25() only exists on the joined full-text query
+        if searching or sort_by != "relevance"
+        for include_content in (False, True)
+    }
+
+
+_SQL_LIST_ALL = _sql_variants("SELECT {columns} FROM reports ORDER BY {order_by} LIMIT ? OFFSET ?")
+
+_SQL_LIST_FOR_USER = _sql_variants('''
+    SELECT {columns} FROM reports WHERE username = ?
+    ORDER BY {order_by} LIMIT ? OFFSET ?
+''')
+
+# Keyset pages for the newest-first listings: rows strictly after the given report, so a
+# deep page is a bounded index range scan instead of stepping over OFFSET rows
+_KEYSET_BEFORE = "(created_at, rowid) < (SELECT created_at, rowid FROM reports WHERE id = ?)"
+
+_SQL_LIST_ALL_BEFORE = _sql_variants(f'''
+    SELECT {{columns}} FROM reports WHERE {_KEYSET_BEFORE}
+    ORDER BY {{order_by}} LIMIT ? OFFSET ?
+''')
+
+_SQL_LIST_FOR_USER_BEFORE = _sql_variants(f'''
+    SELECT {{columns}} FROM reports WHERE username = ? AND {_KEYSET_BEFORE}
+    ORDER BY {{order_by}} LIMIT ? OFFSET ?
+''')
+
+_SQL_LIST_FOR_MODEL = _sql_variants('''
+    SELECT {columns} FROM reports WHERE model_used = ?
+    ORDER BY {order_by} LIMIT ? OFFSET ?
+''')
+
+_SQL_LIST_FOR_FILE = _sql_variants('''
+    SELECT {columns} FROM reports
+    WHERE rowid IN (SELECT report_rowid FROM report_files WHERE file_name = ?)
+        AND (? IS NULL OR username = ?)
+    ORDER BY {order_by} LIMIT ? OFFSET ?
+''')
+
+_FTS_MATCH = "rowid IN (SELECT rowid FROM reports_fts WHERE reports_fts MATCH ?)"
+
+# Joined (rather than rowid IN ...) so the relevance sort can rank with bm25()
+_SQL_SEARCH = _sql_variants('''
+    SELECT {columns} FROM reports
+    JOIN reports_fts ON reports_fts.rowid = reports.rowid
+    WHERE reports_fts MATCH ? AND (? IS NULL OR reports.username = ?)
+    ORDER BY {order_by} LIMIT ? OFFSET ?
+''', searching=True)
+
+# Date-like search terms match a created_at prefix, written as a range so it stays an
+# index seek on idx_reports_created_at, or the full-text index ("2024" in report_2024.py)
+_CREATED_AT_PREFIX = "created_at >= ? AND created_at < ?"
+
+_DATE_OR_FTS_MATCH = f"({_CREATED_AT_PREFIX} OR {_FTS_MATCH})"
+
+_SQL_SEARCH_DATE = _sql_variants(f'''
+    SELECT {{columns}} FROM reports
+    WHERE {_DATE_OR_FTS_MATCH} AND (? IS NULL OR username = ?)
+    ORDER BY {{order_by}} LIMIT ? OFFSET ?
+''')
+
+_SQL_COUNT = "SELECT COUNT(*) FROM reports WHERE ? IS NULL OR username = ?"
+
+_SQL_COUNT_SEARCH_DATE = (
+    f"SELECT COUNT(*) FROM reports WHERE {_DATE_OR_FTS_MATCH} AND (? IS NULL OR username = ?)"
+)
+
+_SQL_COUNT_SEARCH = f"SELECT COUNT(*) FROM reports WHERE {_FTS_MATCH} AND (? IS NULL OR username = ?)"
+
+_SQL_DELETE_REPORT = "DELETE FROM reports WHERE id = ? RETURNING review_path"
+
+_SQL_DATE_RANGE = {
+    include_content: f'''
+    SELECT {_REPORT_COLUMNS if include_content else _LISTING_COLUMNS} FROM reports
+    WHERE DATE(created_at) BETWEEN ? AND ?
+    ORDER BY created_at DESC
+'''
+    for include_content in (False, True)
+}
+
+# One range delete over idx_reports_created_at instead of a DELETE per report
+_SQL_CLEANUP = "DELETE FROM reports WHERE created_at < datetime('now', ?) RETURNING pdf_path, review_path"
+
+_SQL_STATS = "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM reports"
+
+
+class LazyMetadata(Mapping):
+    """Read-only view of a report's metadata that only parses the JSON when first read"""
+
+    __slots__ = ("_raw", "_report_id", "_data")
+
+    def __init__(self, raw: Optional[str], report_id: Optional[str] = None):
+        self._raw = raw
+        self._report_id = report_id
+        self._data = None
+
+    def _decoded(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = _decode_metadata(self._raw, self._report_id)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._decoded()[key]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
+
+    def __repr__(self):
+        return repr(self._decoded())
+
+    def __getstate__(self):
+        return (self._raw, self._report_id)
+
+    def __setstate__(self, state):
+        self._raw, self._report_id = state
+        self._data = None
+
+
+def _review_preview(review_content: Optional[str]) -> Optional[str]:
+    """Truncate a review the way listings display it"""
+    if review_content is None or len(review_content) <= REVIEW_PREVIEW_LENGTH:
+        return review_content
+    return review_content[:REVIEW_PREVIEW_LENGTH] + "..."
+
+
+def _encode_metadata(metadata: Optional[Mapping]) -> Optional[str]:
+    """Serialize metadata for storage; NULL when empty"""
+    if not metadata:
+        return None
+    return _json_dumps(metadata if isinstance(metadata, dict) else dict(metadata))
+
+
+def _decode_metadata(metadata: Optional[str], report_id: Optional[str] = None) -> Dict[str, Any]:
+    """Decode a stored metadata document, logging (not hiding) corrupt rows"""
+    if not metadata:
+        return {}
+    try:
+        return _json_loads(metadata)
+    except ValueError as e:
+        print(f"⚠️ Corrupt metadata on report {report_id or '?'}: {str(e)}")
+        return {}
+
+
+def _new_id() -> str:
+    """
+    Generate a UUIDv7 report ID (RFC 9562): 48-bit Unix milliseconds, then random bits
+
+    IDs from later saves sort after earlier ones, so inserts into the UNIQUE id index
+    append at its right edge instead of landing on random pages
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                           # version
+        | (rand >> 68) << 64                  # rand_a, 12 bits
+        | 0b10 << 62                          # RFC 4122 variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF        # rand_b, 62 bits
+    )
+    return str(uuid.UUID(int=value))
+
+
+def _row_to_report(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a reports row to a dictionary, deferring the metadata JSON parse until it is read"""
+    report = dict(row)
+    report["metadata"] = LazyMetadata(report["metadata"], report.get("id"))
+    if "review_path" in report:
+        review_path = report.pop("review_path")
+        if review_path:
+            report["review_content"] = _read_review(review_path)
+    return report
+
+
+def _compress_review(review_content: str) -> bytes:
+    data = review_content.encode("utf-8")
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _read_review(path: str) -> str:
+    """Load a stored review body, logging (not raising) when the file is missing or unreadable"""
+    try:
+        with open(path, "rb") as review_file:
+            data = review_file.read()
+        if path.endswith(".zst"):
+            if zstandard is None:
+                raise OSError("zstandard is required to read this review")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+    except Exception as e:
+        print(f"⚠️ Could not read review file {path}: {str(e)}")
+        return ""
+
+
+def _remove_file(path: str):
+    """Delete a file, ignoring files that are already gone or cannot be removed"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 class DatabaseManager:
     """Manages SQLite database operations for code review reports"""
 
-    def __init__(self, db_path: str = "db/code_reviews.db"):
+    def __init__(
+        self,
+        db_path: str = "db/code_reviews.db",
+        pragmas: Optional[Dict[str, Any]] = None,
+        readers: int = READER_POOL_SIZE,
+        reviews_dir: Optional[str] = None,
+    ):
         """
         Initialize database manager
 
         Args:
             db_path: Path to SQLite database file
+            pragmas: PRAGMA settings overriding DEFAULT_PRAGMAS
+            readers: Number of pooled read-only connections
+            reviews_dir: Directory for compressed review bodies (default: "reviews" beside db_path)
         """
         self.db_path = db_path
+        self.reviews_dir = reviews_dir or os.path.join(os.path.dirname(db_path), "reviews")
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
         self._ensure_db_directory()
+        self._write_lock = threading.Lock()
+        # Bumped on every write so callers can cache reads keyed on it
+        self._version = 0
+        self._writer = self._connect()
         self._init_database()
+        # Opened after migrations so readers never see a half-built schema
+        self._readers = queue.Queue()
+        for _ in range(max(1, readers)):
+            self._readers.put(self._connect(read_only=True))
 
     # -------------------------------------------------------------------------
     # 📁 Setup & Schema Management
@@ -34,48 +661,128 @@ class DatabaseManager:
         if not os.path.exists(db_dir):
             os.makedirs(db_dir)
 
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection: the single writer, or one of the pooled readers"""
+        try:
+            # Autocommit mode; Streamlit calls in from several threads, so connections are
+            # handed out one thread at a time by _get_writer()/_get_reader()
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                # Keep every statement below compiled for the lifetime of the connection
+                cached_statements=256,
+            )
+            # The writer already settled page_size/journal_mode for the file
+            self._configure(conn, database_pragmas=not read_only)
+            if read_only:
+                conn.execute("PRAGMA query_only=1")
+            return conn
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to open database: {str(e)}")
+
+    def _configure(self, conn: sqlite3.Connection, database_pragmas: bool = True):
+        """
+        Apply PRAGMA settings and the row factory to a freshly opened connection
+
+        Args:
+            conn: Connection to configure
+            database_pragmas: Also apply the pragmas persisted in the file (page_size, journal_mode)
+        """
+        for name, value in self.pragmas.items():
+            if name in _DATABASE_PRAGMAS and not database_pragmas:
+                continue
+            result = conn.execute(f"PRAGMA {name}={value}").fetchone()
+            # journal_mode reports the mode actually in effect (e.g. "memory" for :memory: databases)
+            if name == "journal_mode" and result and str(result[0]).lower() != str(value).lower():
+                print(f"⚠️ journal_mode={value} not applied, using {result[0]}")
+        # Rows come back as sqlite3.Row so dict(row) keys by column name in C
+        conn.row_factory = sqlite3.Row
+
+    @property
+    def data_version(self) -> int:
+        """Monotonic counter that changes whenever reports are written"""
+        return self._version
+
+    @contextmanager
+    def _get_writer(self):
+        """Hold the writer connection exclusively for the duration of the block"""
+        with self._write_lock:
+            yield self._writer
+
+    @contextmanager
+    def _get_reader(self):
+        """Borrow a read-only connection from the pool, waiting if all are in use"""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def close(self):
+        """Close the writer and every pooled reader connection"""
+        with self._write_lock:
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
     def _init_database(self):
         """Initialize or migrate database schema"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_writer() as conn:
                 cursor = conn.cursor()
 
-                # Create reports table (fresh DBs)
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS reports (
-                        id TEXT PRIMARY KEY,
-                        username TEXT NOT NULL,
-                        files TEXT NOT NULL,
-                        pdf_path TEXT NOT NULL,
-                        review_content TEXT NOT NULL,
-                        metadata TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                # Steady-state startup: the schema is current, so skip all DDL
+                cursor.execute("PRAGMA user_version")
+                version = cursor.fetchone()[0]
+                if version >= SCHEMA_VERSION:
+                    return
 
-                # 🧩 Schema Migration Check — Ensure "username" column exists
-                cursor.execute("PRAGMA table_info(reports)")
-                columns = [row[1] for row in cursor.fetchall()]
+                if version < 1:
+                    self._migrate_to_v1(conn)
+                if version < 2:
+                    conn.executescript(_SCHEMA_V2)
+                if version < 3:
+                    conn.executescript(_SCHEMA_V3)
+                if version < 4:
+                    conn.executescript(_SCHEMA_V4)
+                if version < 5:
+                    conn.executescript(_SCHEMA_V5)
+                if version < 6:
+                    conn.executescript(_SCHEMA_V6)
+                if version < 7:
+                    conn.executescript(_SCHEMA_V7)
+                if version < 8:
+                    conn.executescript(_SCHEMA_V8)
+                if version < 9:
+                    conn.executescript(_SCHEMA_V9)
+                if version < 10:
+                    conn.executescript(_SCHEMA_V10)
 
-                if "username" not in columns:
-                    print("🧩 Migrating database: Adding missing 'username' column...")
-                    cursor.execute("ALTER TABLE reports ADD COLUMN username TEXT DEFAULT 'unknown'")
-                    cursor.execute(
-                        "UPDATE reports SET username = 'unknown' WHERE username IS NULL OR username = ''"
-                    )
-                    conn.commit()
-                    print("✅ Migration complete: Added 'username' column.")
+        except sqlite3.Error as e:
+            if self._writer.in_transaction:
+                self._writer.rollback()
+            raise Exception(f"Failed to initialize database: {str(e)}")
 
-                # Create indexes for performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports(created_at)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reports_files ON reports(files)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_reports_username ON reports(username)')
+    def _migrate_to_v1(self, conn: sqlite3.Connection):
+        """Create the base schema, upgrading databases that predate the username column"""
+        cursor = conn.cursor()
+        # 🧩 Schema Migration Check — Ensure "username" column exists
+        cursor.execute("PRAGMA table_info(reports)")
+        columns = [row[1] for row in cursor.fetchall()]
 
-                conn.commit()
+        if columns and "username" not in columns:
+            print("🧩 Migrating database: Adding missing 'username' column...")
+            cursor.execute("ALTER TABLE reports ADD COLUMN username TEXT DEFAULT 'unknown'")
+            cursor.execute(
+                "UPDATE reports SET username = 'unknown' WHERE username IS NULL OR username = ''"
+            )
+            print("✅ Migration complete: Added 'username' column.")
 
-        except sqlite3.Error as e:
-            raise Exception(f"Failed to initialize database: {str(e)}")
+        conn.executescript(_SCHEMA_V1)
 
     # -------------------------------------------------------------------------
     # 💾 CRUD Operations
@@ -87,151 +794,407 @@ class DatabaseManager:
         pdf_path: str,
         review_content: str,
         metadata: Dict[str, Any],
+        content_hash: Optional[str] = None,
+        embedding: Optional[bytes] = None,
     ) -> str:
         """Save a new code review report"""
-        try:
-            report_id = str(uuid.uuid4())
-            files_str = ", ".join(files)
-            metadata_str = json.dumps(metadata) if metadata else None
+        return self.save_reports_bulk([{
+            "username": username,
+            "files": files,
+            "pdf_path": pdf_path,
+            "review_content": review_content,
+            "metadata": metadata,
+            "content_hash": content_hash,
+            "embedding": embedding,
+        }])[0]
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    '''
-                    INSERT INTO reports (id, username, files, pdf_path, review_content, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ''',
-                    (report_id, username, files_str, pdf_path, review_content, metadata_str),
+    def save_reports_bulk(self, reports: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save several reports in a single write transaction
+
+        Args:
+            reports: Dictionaries with the save_report arguments as keys
+                (content_hash and embedding are optional)
+
+        Returns:
+            The new report IDs, in input order
+        """
+        if not reports:
+            return []
+        report_ids = [_new_id() for _ in reports]
+        review_paths = []
+        try:
+            # Written before the transaction so the write lock is never held across file I/O
+            for report_id, report in zip(report_ids, reports):
+                review_paths.append(self._write_review(report_id, report["review_content"]))
+            rows = [
+                (
+                    report_id,
+                    report["username"],
+                    ", ".join(report["files"]),
+                    report["pdf_path"],
+                    "",
+                    review_path,
+                    _review_preview(report["review_content"]),
+                    _encode_metadata(report.get("metadata")),
+                    report.get("content_hash"),
+                    report.get("embedding"),
                 )
-                conn.commit()
-            return report_id
+                for report_id, report, review_path in zip(report_ids, reports, review_paths)
+            ]
+            fts_rows = [
+                (report["review_content"], report_id) for report_id, report in zip(report_ids, reports)
+            ]
+            file_rows = [
+                (file_name, report_id)
+                for report_id, report in zip(report_ids, reports)
+                for file_name in report["files"]
+            ]
+
+            with self._get_writer() as conn:
+                # One transaction (and one WAL commit) for the whole batch
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(_SQL_INSERT_REPORT, rows)
+                    conn.executemany(_SQL_INSERT_FTS, fts_rows)
+                    conn.executemany(_SQL_INSERT_REPORT_FILE, file_rows)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self._version += 1
+            return report_ids
 
         except sqlite3.Error as e:
+            for review_path in review_paths:
+                _remove_file(review_path)
             raise Exception(f"Failed to save report: {str(e)}")
+        except BaseException:
+            # A failed file write, a bad row or an interrupt: drop the bodies already written
+            for review_path in review_paths:
+                _remove_file(review_path)
+            raise
 
     def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific report by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, username, files, pdf_path, review_content, metadata, created_at, updated_at
-                    FROM reports WHERE id = ?
-                ''', (report_id,))
+                cursor.execute(_SQL_GET_REPORT, (report_id,))
                 row = cursor.fetchone()
-                return self._row_to_dict(row) if row else None
+                return _row_to_report(row) if row else None
         except sqlite3.Error as e:
             raise Exception(f"Failed to get report: {str(e)}")
 
-    def get_all_reports(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all reports with optional pagination"""
+    def get_report_content(self, report_id: str) -> Optional[str]:
+        """Get the full review text of one report (listings only carry the preview)"""
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_GET_REPORT_CONTENT, (report_id,))
+                row = cursor.fetchone()
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get report content: {str(e)}")
+        if not row:
+            return None
+        return _read_review(row["review_path"]) if row["review_path"] else row["review_content"]
+
+    def get_cached_review(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the latest stored review for an identical submission, if any"""
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_GET_CACHED_REVIEW, (content_hash,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                return {
+                    "review_content": (
+                        _read_review(row["review_path"]) if row["review_path"] else row["review_content"]
+                    ),
+                    "metadata": _decode_metadata(row["metadata"]),
+                }
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get cached review: {str(e)}")
+
+    def get_review_embeddings(self, model_used: str) -> List[Dict[str, Any]]:
+        """Get the id and stored embedding of every report reviewed by the given model"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                query = '''
-                    SELECT id, username, files, pdf_path, review_content, metadata, created_at, updated_at
-                    FROM reports ORDER BY created_at DESC
-                '''
-                params = []
-                if limit:
-                    query += " LIMIT ?"
-                    params.append(limit)
-                if offset:
-                    query += " OFFSET ?"
-                    params.append(offset)
+                cursor.execute(_SQL_GET_EMBEDDINGS, (model_used,))
+                return list(map(dict, cursor))
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get review embeddings: {str(e)}")
+
+    def get_all_reports(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort_by: str = "newest",
+        include_content: bool = False,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all reports with optional pagination
+
+        Args:
+            before: Report ID of the last row on the previous page; continues newest-first
+                from there without an OFFSET scan
+        """
+        variant = (self._sort_key(sort_by), include_content)
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                if before is None:
+                    query, params = _SQL_LIST_ALL[variant], self._page(limit, offset)
+                else:
+                    self._require_keyset_sort(sort_by)
+                    query, params = _SQL_LIST_ALL_BEFORE[variant], (before, *self._page(limit, offset))
                 cursor.execute(query, params)
-                return [self._row_to_dict(row) for row in cursor.fetchall()]
+                return list(map(_row_to_report, cursor))
         except sqlite3.Error as e:
             raise Exception(f"Failed to get reports: {str(e)}")
 
-    def get_reports_for_user(self, username: str) -> List[Dict[str, Any]]:
-        """Get all reports created by a specific user"""
+    def get_reports_for_user(
+        self,
+        username: str,
+        sort_by: str = "newest",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_content: bool = False,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get reports created by a specific user with optional pagination
+
+        Args:
+            before: Report ID of the last row on the previous page; continues newest-first
+                from there without an OFFSET scan
+        """
+        variant = (self._sort_key(sort_by), include_content)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, username, files, pdf_path, review_content, metadata, created_at, updated_at
-                    FROM reports WHERE username = ? ORDER BY created_at DESC
-                ''', (username,))
-                return [self._row_to_dict(row) for row in cursor.fetchall()]
+                if before is None:
+                    query, params = _SQL_LIST_FOR_USER[variant], (username, *self._page(limit, offset))
+                else:
+                    self._require_keyset_sort(sort_by)
+                    query = _SQL_LIST_FOR_USER_BEFORE[variant]
+                    params = (username, before, *self._page(limit, offset))
+                cursor.execute(query, params)
+                return list(map(_row_to_report, cursor))
         except sqlite3.Error as e:
             raise Exception(f"Failed to get reports for user {username}: {str(e)}")
 
-    def search_reports(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search reports by filename, content, or username"""
+    def get_reports_by_model(
+        self,
+        model_used: str,
+        sort_by: str = "newest",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_content: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get reports reviewed by a specific model, filtered on the indexed model_used column"""
+        variant = (self._sort_key(sort_by), include_content)
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    _SQL_LIST_FOR_MODEL[variant],
+                    (model_used, *self._page(limit, offset)),
+                )
+                return list(map(_row_to_report, cursor))
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get reports for model {model_used}: {str(e)}")
+
+    def get_reports_by_file(
+        self,
+        file_name: str,
+        username: Optional[str] = None,
+        sort_by: str = "newest",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_content: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get reports that reviewed a file with exactly this name, optionally for one user"""
+        variant = (self._sort_key(sort_by), include_content)
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    _SQL_LIST_FOR_FILE[variant],
+                    (file_name, username, username, *self._page(limit, offset)),
+                )
+                return list(map(_row_to_report, cursor))
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get reports for file {file_name}: {str(e)}")
+
+    def search_reports(
+        self,
+        search_term: str,
+        username: Optional[str] = None,
+        sort_by: str = "newest",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_content: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search reports by filename, content, or username, optionally limited to one user;
+        a date-like term ("2025-10", "2025-10-12 14") also matches reports created in that period
+        """
+        if not search_term.strip():
+            # A blank term is no filter, as in get_reports_count
+            if username:
+                return self.get_reports_for_user(
+                    username, sort_by=sort_by, limit=limit, offset=offset, include_content=include_content
+                )
+            return self.get_all_reports(
+                limit=limit, offset=offset, sort_by=sort_by, include_content=include_content
+            )
+        date_bounds = self._date_prefix_bounds(search_term)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, username, files, pdf_path, review_content, metadata, created_at, updated_at
-                    FROM reports
-                    WHERE username LIKE ? OR files LIKE ? OR review_content LIKE ?
-                    ORDER BY created_at DESC
-                ''', (f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"))
-                return [self._row_to_dict(row) for row in cursor.fetchall()]
+                if date_bounds:
+                    # No full-text rank for a date match, so relevance falls back to newest
+                    variant = (self._sort_key(sort_by), include_content)
+                    cursor.execute(
+                        _SQL_SEARCH_DATE[variant],
+                        (
+                            *date_bounds, self._fts_query(search_term), username, username,
+                            *self._page(limit, offset),
+                        ),
+                    )
+                else:
+                    variant = (self._sort_key(sort_by, searching=True), include_content)
+                    cursor.execute(
+                        _SQL_SEARCH[variant],
+                        (self._fts_query(search_term), username, username, *self._page(limit, offset)),
+                    )
+                return list(map(_row_to_report, cursor))
         except sqlite3.Error as e:
             raise Exception(f"Failed to search reports: {str(e)}")
 
     def update_report(self, report_id: str, **kwargs) -> bool:
         """Update a report record"""
         try:
-            if not kwargs:
+            fields = tuple(field for field in _UPDATE_FIELDS if field in kwargs)
+            if not fields:
                 return False
 
-            set_clauses, params = [], []
-            for key, value in kwargs.items():
-                if key in ["username", "files", "pdf_path", "review_content", "metadata"]:
-                    set_clauses.append(f"{key} = ?")
-                    params.append(json.dumps(value) if key == "metadata" and isinstance(value, dict) else value)
-
-            if not set_clauses:
-                return False
-
-            set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+            params = []
+            file_names = None
+            review_content = None
+            review_path = None
+            for field in fields:
+                value = kwargs[field]
+                if field == "files" and isinstance(value, (list, tuple)):
+                    # Keep report_files in step with the joined files column
+                    file_names = list(value)
+                    params.append(", ".join(file_names))
+                elif field == "files" and isinstance(value, str):
+                    # An already-joined string: split it on ", " like the v7 backfill
+                    file_names = [name for name in value.split(", ") if name]
+                    params.append(value)
+                elif field == "review_content":
+                    # Stored out of row, like save_reports_bulk
+                    review_content = value
+                    review_path = self._write_review(report_id, review_content)
+                    params.extend(["", review_path, _review_preview(review_content)])
+                elif field == "metadata" and isinstance(value, Mapping):
+                    params.append(_encode_metadata(value))
+                else:
+                    params.append(value)
             params.append(report_id)
-            query = f"UPDATE reports SET {', '.join(set_clauses)} WHERE id = ?"
+            query = _SQL_UPDATE_REPORT[fields]
 
-            with sqlite3.connect(self.db_path) as conn:
+            old_review_path = None
+            with self._get_writer() as conn:
                 cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                return cursor.rowcount > 0
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    if review_path is not None:
+                        cursor.execute(_SQL_GET_REVIEW_PATH, (report_id,))
+                        row = cursor.fetchone()
+                        old_review_path = row[0] if row else None
+                    cursor.execute(query, params)
+                    updated = cursor.rowcount > 0
+                    if updated and file_names is not None:
+                        cursor.execute(_SQL_CLEAR_REPORT_FILES, (report_id,))
+                        cursor.executemany(
+                            _SQL_INSERT_REPORT_FILE, [(name, report_id) for name in file_names]
+                        )
+                    if updated and review_path is not None:
+                        cursor.execute(_SQL_UPDATE_FTS_REVIEW, (review_content, report_id))
+                    cursor.execute("COMMIT")
+                except sqlite3.Error:
+                    cursor.execute("ROLLBACK")
+                    if review_path is not None:
+                        _remove_file(review_path)
+                    raise
+                if updated:
+                    self._version += 1
+
+            if review_path is not None:
+                # Drop whichever body is no longer referenced
+                _remove_file(old_review_path if updated else review_path)
+            return updated
         except sqlite3.Error as e:
             raise Exception(f"Failed to update report: {str(e)}")
 
     def delete_report(self, report_id: str) -> bool:
         """Delete a report from the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_writer() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM reports WHERE id = ?", (report_id,))
-                conn.commit()
-                return cursor.rowcount > 0
+                cursor.execute(_SQL_DELETE_REPORT, (report_id,))
+                deleted = cursor.fetchall()
+                if deleted:
+                    self._version += 1
         except sqlite3.Error as e:
             raise Exception(f"Failed to delete report: {str(e)}")
 
-    def get_reports_count(self) -> int:
-        """Get total number of reports"""
+        for (review_path,) in deleted:
+            if review_path:
+                _remove_file(review_path)
+        return bool(deleted)
+
+    def get_reports_count(
+        self, username: Optional[str] = None, search_term: Optional[str] = None
+    ) -> int:
+        """Get number of reports, optionally for one user and/or matching a search term"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM reports")
+                date_bounds = self._date_prefix_bounds(search_term) if search_term else None
+                if date_bounds:
+                    cursor.execute(
+                        _SQL_COUNT_SEARCH_DATE,
+                        (*date_bounds, self._fts_query(search_term), username, username),
+                    )
+                elif search_term and search_term.strip():
+                    cursor.execute(
+                        _SQL_COUNT_SEARCH, (self._fts_query(search_term), username, username)
+                    )
+                else:
+                    cursor.execute(_SQL_COUNT, (username, username))
                 return cursor.fetchone()[0]
         except sqlite3.Error as e:
             raise Exception(f"Failed to get reports count: {str(e)}")
 
-    def get_reports_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def get_reports_by_date_range(
+        self, start_date: str, end_date: str, include_content: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get reports within a date range"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, username, files, pdf_path, review_content, metadata, created_at, updated_at
-                    FROM reports
-                    WHERE DATE(created_at) BETWEEN ? AND ?
-                    ORDER BY created_at DESC
-                ''', (start_date, end_date))
-                return [self._row_to_dict(row) for row in cursor.fetchall()]
+                cursor.execute(
+                    _SQL_DATE_RANGE[include_content],
+                    (start_date, end_date),
+                )
+                return list(map(_row_to_report, cursor))
         except sqlite3.Error as e:
             raise Exception(f"Failed to get reports by date range: {str(e)}")
 
@@ -240,37 +1203,34 @@ class DatabaseManager:
     # -------------------------------------------------------------------------
     def cleanup_old_reports(self, days_old: int = 30) -> int:
         """Remove reports older than N days"""
+        days_old = int(days_old)
+        if days_old < 0:
+            # "--5 days" is not a valid datetime() modifier and would silently match nothing
+            raise ValueError("days_old must not be negative")
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_writer() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f'''
-                    SELECT id, pdf_path FROM reports
-                    WHERE created_at < datetime('now', '-{days_old} days')
-                ''')
-                old_reports = cursor.fetchall()
-                deleted_count = 0
-                for report_id, pdf_path in old_reports:
-                    if os.path.exists(pdf_path):
-                        try:
-                            os.remove(pdf_path)
-                        except OSError:
-                            pass
-                    cursor.execute("DELETE FROM reports WHERE id = ?", (report_id,))
-                    deleted_count += 1
-                conn.commit()
-                return deleted_count
+                cursor.execute(_SQL_CLEANUP, (f"-{days_old} days",))
+                deleted = cursor.fetchall()
+                if deleted:
+                    self._version += 1
         except sqlite3.Error as e:
             raise Exception(f"Failed to cleanup old reports: {str(e)}")
 
+        # Remove the PDFs and review bodies concurrently, outside the database lock
+        unique_paths = set(filter(None, (path for row in deleted for path in row)))
+        if unique_paths:
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_paths))) as executor:
+                list(executor.map(_remove_file, unique_paths))
+        return len(deleted)
+
     def get_database_stats(self) -> Dict[str, Any]:
         """Return database size and report stats"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM reports")
-                total_reports = cursor.fetchone()[0]
-                cursor.execute("SELECT MIN(created_at), MAX(created_at) FROM reports")
-                oldest, newest = cursor.fetchone()
+                cursor.execute(_SQL_STATS)
+                total_reports, oldest, newest = cursor.fetchone()
                 db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
                 return {
                     "total_reports": total_reports,
@@ -285,20 +1245,50 @@ class DatabaseManager:
     # -------------------------------------------------------------------------
     # 🔁 Utilities
     # -------------------------------------------------------------------------
-    def _row_to_dict(self, row: tuple) -> Dict[str, Any]:
-        """Convert DB row to dictionary"""
+    def _sort_key(self, sort_by: str, searching: bool = False) -> str:
+        """Validate a sort option and return the key of its precomputed query variant"""
+        if sort_by not in _ORDER_BY:
+            raise ValueError(f"Unknown sort option: {sort_by}")
+        # Relevance only means something against a search term; otherwise list newest first
+        if sort_by == "relevance" and not searching:
+            return "newest"
+        return sort_by
+
+    def _write_review(self, report_id: str, review_content: str) -> str:
+        """Compress a review body into its own file and return the path"""
         try:
-            metadata = json.loads(row[5]) if row[5] else {}
-        except (json.JSONDecodeError, TypeError):
-            metadata = {}
-
-        return {
-            "id": row[0],
-            "username": row[1],
-            "files": row[2],
-            "pdf_path": row[3],
-            "review_content": row[4],
-            "metadata": metadata,
-            "created_at": row[6],
-            "updated_at": row[7],
-        }
+            os.makedirs(self.reviews_dir, exist_ok=True)
+            # A fresh name per write, so an update never overwrites the body a reader still sees
+            path = os.path.join(self.reviews_dir, f"{report_id}-{os.urandom(4).hex()}{_REVIEW_SUFFIX}")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as review_file:
+                review_file.write(_compress_review(review_content))
+            os.replace(tmp_path, path)
+            return path
+        except OSError as e:
+            raise Exception(f"Failed to write review file: {str(e)}")
+
+    def _require_keyset_sort(self, sort_by: str):
+        """Keyset pages follow the (created_at, rowid) order, so only newest-first supports them"""
+        if sort_by not in ("newest", "relevance"):
+            raise ValueError(f"Keyset pagination (before=...) requires newest-first order, not {sort_by}")
+
+    def _page(self, limit: Optional[int], offset: int) -> tuple:
+        """LIMIT/OFFSET parameters; SQLite treats a negative LIMIT as unbounded"""
+        return (limit if limit is not None else -1, offset)
+
+    def _date_prefix_bounds(self, search_term: str) -> Optional[tuple]:
+        """[start, end) created_at range for a date-like term, or None for a text search"""
+        prefix = search_term.strip().replace("T", " ")
+        if not _DATE_TERM_RE.fullmatch(prefix):
+            return None
+        if prefix.isdigit():
+            # created_at has NUMERIC affinity, so bounds like "2025" or "2026" would be compared as
+            # numbers; anchor a bare year on the "YYYY-" text prefix instead
+            return (f"{prefix}-", f"{int(prefix) + 1}-")
+        # Every timestamp starting with the prefix sorts before the prefix with its last character bumped
+        return (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    def _fts_query(self, search_term: str) -> str:
+        """Quote user input as a single FTS5 prefix phrase so operators are not interpreted"""
+        return '"' + search_term.strip().replace('"', '""') + '"*'
@@ -1,8 +1,31 @@
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# F(92) is the largest Fibonacci number that fits in a signed 64-bit integer
+MAX_FIB_INT64 = 92
+
+if numba is not None:
+    @numba.njit('int64(int64)', cache=True)
+    def _fib_int64(n):
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+else:
+    _fib_int64 = None
+
 def calculate_fibonacci(n):
     """Calculate the nth Fibonacci number"""
     if n <= 1:
         return n
-    return calculate_fibonacci(n-1) + calculate_fibonacci(n-2)
+    if _fib_int64 is not None and n <= MAX_FIB_INT64:
+        return int(_fib_int64(n))
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
 
 def main():
     try:
@@ -4,12 +4,72 @@ Handles communication with OpenRouter API for code analysis
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
 import json
 import os
-from typing import List, Dict, Any, Optional
+import hashlib
+import importlib.util
+from typing import List, Dict, Any, Iterator, Optional
 import time
 from datetime import datetime
 
+# orjson encodes straight to bytes and decodes several times faster; its JSONDecodeError
+# subclasses json.JSONDecodeError, so the handlers below catch either
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+    _json_loads = json.loads
+
+# HTTP/2 lets the concurrent per-file requests share one multiplexed connection;
+# httpx only offers it when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Upper bound on in-flight per-file requests, kept below OpenRouter's rate limits
+MAX_CONCURRENT_REVIEWS = 8
+
+# Rate-limit/gateway statuses retried with exponential backoff (sync session and async path)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+# Longest Retry-After the async path will honour before simply failing the attempt
+MAX_RETRY_AFTER = 10.0
+
+# Fixed instructions that open every review prompt
+_PROMPT_HEADER = "\n".join([
+    "You are an expert code reviewer. Please analyze the following code files and provide a comprehensive review.",
+    "",
+    "**Review Requirements:**",
+    "1. **Code Quality & Readability**: Assess code clarity, naming conventions, and structure",
+    "2. **Modularity & Architecture**: Evaluate code organization, separation of concerns, and reusability",
+    "3. **Potential Bugs**: Identify logical errors, edge cases, and potential runtime issues",
+    "4. **Security Issues**: Look for vulnerabilities, input validation, and security best practices",
+    "5. **Performance**: Comment on efficiency, optimization opportunities, and resource usage",
+    "6. **Best Practices**: Suggest improvements based on language-specific conventions",
+    "7. **Suggestions**: Provide actionable recommendations for improvement",
+    "",
+    "**Response Format:**",
+    "Please structure your response using clear markdown sections with headers:",
+    "- ## Code Quality & Readability",
+    "- ## Modularity & Architecture", 
+    "- ## Potential Bugs",
+    "- ## Security Issues",
+    "- ## Performance Analysis",
+    "- ## Best Practices",
+    "- ## Improvement Suggestions",
+    "",
+    "**Code Files to Review:**",
+    ""
+])
+
+_PROMPT_FOOTER = "Please provide a thorough analysis following the format above. Be specific and actionable in your recommendations."
+
 class CodeReviewLLM:
     """Client for interacting with OpenRouter API for code review"""
     
@@ -19,7 +79,8 @@ class CodeReviewLLM:
         from dotenv import load_dotenv
         load_dotenv(override=True)
         self.api_key = os.getenv('OPENROUTER_API_KEY')
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = "https://openrouter.ai/api/v1"
+        self.chat_url = f"{self.base_url}/chat/completions"
         self.model = "qwen/qwen-2.5-coder-32b-instruct:free"
         
         if not self.api_key:
@@ -34,6 +95,19 @@ class CodeReviewLLM:
             "HTTP-Referer": "http://localhost",
             "X-Title": "CodeReviewAssistant"
         }
+        
+        # Shared session: keeps the HTTPS connection (and TLS session) alive between calls,
+        # and retries rate-limit/gateway errors with backoff before surfacing them
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
     
     def review_code(self, file_contents: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -46,38 +120,10 @@ class CodeReviewLLM:
             Dictionary with success status, review content, and metadata
         """
         try:
-            # Prepare the prompt
-            prompt = self._build_review_prompt(file_contents)
-            
-            # Prepare the request payload
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3,
-                "max_tokens": 4000,
-                "stream": False
-            }
-            
-            # Make the API request using the exact format from OpenRouter docs
-            response = requests.post(
-                url=self.base_url,
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=60
-            )
-            
-            # Check for HTTP errors
-            response.raise_for_status()
-            
-            # Parse the response
-            response_data = response.json()
-            
-            if 'choices' not in response_data or not response_data['choices']:
+            # Consume the streamed completion; chunks are joined once at the end
+            usage = {}
+            parts = list(self._stream_review(file_contents, usage))
+            if not parts:
                 return {
                     'success': False,
                     'error': 'No response from LLM',
@@ -85,24 +131,10 @@ class CodeReviewLLM:
                     'metadata': {}
                 }
             
-            # Extract the review content
-            review_content = response_data['choices'][0]['message']['content']
-            
-            # Extract metadata
-            metadata = {
-                'model_used': self.model,
-                'timestamp': datetime.now().isoformat(),
-                'files_reviewed': len(file_contents),
-                'file_names': [f['name'] for f in file_contents],
-                'total_tokens': response_data.get('usage', {}).get('total_tokens', 0),
-                'prompt_tokens': response_data.get('usage', {}).get('prompt_tokens', 0),
-                'completion_tokens': response_data.get('usage', {}).get('completion_tokens', 0)
-            }
-            
             return {
                 'success': True,
-                'review': review_content,
-                'metadata': metadata,
+                'review': "".join(parts),
+                'metadata': self._build_metadata(file_contents, usage),
                 'error': None
             }
             
@@ -135,6 +167,283 @@ class CodeReviewLLM:
                 'metadata': {}
             }
     
+    def review_code_stream(self, file_contents: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Stream a review as it is generated
+        
+        Args:
+            file_contents: List of dictionaries containing file info and content
+            
+        Yields:
+            Review text fragments in order; request errors are raised to the caller
+        """
+        yield from self._stream_review(file_contents, {})
+    
+    def _stream_review(
+        self, file_contents: List[Dict[str, Any]], usage: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Yield content deltas from OpenRouter's SSE stream, recording token usage into `usage`"""
+        prompt = self._build_review_prompt(file_contents)
+        
+        with self.session.post(
+            self.chat_url,
+            data=_json_dumps(self._build_payload(prompt, stream=True)),
+            timeout=60,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            
+            # Split the raw bytes and decode each line as UTF-8: SSE responses carry no
+            # charset (requests would assume ISO-8859-1), and str.splitlines() would also break
+            # lines on U+0085, i.e. the 0x85 byte inside characters such as "✅"
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8")
+                # Skip keep-alives and SSE comments (": OPENROUTER PROCESSING")
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                
+                chunk = _json_loads(data)
+                if 'error' in chunk:
+                    # OpenRouter sends {"message": ...}; some upstreams send a bare string
+                    err = chunk['error']
+                    raise requests.exceptions.RequestException(
+                        err.get('message', str(err)) if isinstance(err, dict) else str(err)
+                    )
+                if chunk.get('usage'):
+                    usage.update(chunk['usage'])
+                for choice in chunk.get('choices', []):
+                    content = choice.get('delta', {}).get('content')
+                    if content:
+                        yield content
+    
+    async def areview_file(
+        self,
+        client: httpx.AsyncClient,
+        file_info: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Review a single file over a shared async HTTP client
+        
+        Args:
+            client: Open async client carrying the API headers
+            file_info: File dictionary with name, size, type and content
+            semaphore: Limits how many requests are in flight at once
+            
+        Returns:
+            Dictionary with success status, review content, and metadata
+        """
+        try:
+            body = _json_dumps(self._build_payload(self._build_review_prompt([file_info])))
+            async with semaphore:
+                # Back off while holding the slot, so a rate-limit burst also slows the other files
+                for attempt in range(MAX_RETRIES + 1):
+                    response = await client.post(self.chat_url, content=body)
+                    if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        break
+                    await asyncio.sleep(self._retry_delay(response, attempt))
+            response.raise_for_status()
+            return self._parse_completion(_json_loads(response.content), [file_info])
+            
+        except httpx.TimeoutException:
+            return {
+                'success': False,
+                'error': 'Request timeout - LLM took too long to respond',
+                'review': None,
+                'metadata': {}
+            }
+        except httpx.HTTPError as e:
+            return {
+                'success': False,
+                'error': f'API request failed: {str(e)}',
+                'review': None,
+                'metadata': {}
+            }
+        except json.JSONDecodeError as e:
+            return {
+                'success': False,
+                'error': f'Failed to parse API response: {str(e)}',
+                'review': None,
+                'metadata': {}
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Unexpected error: {str(e)}',
+                'review': None,
+                'metadata': {}
+            }
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff"""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        except (TypeError, ValueError):
+            return RETRY_BACKOFF * (2 ** attempt)
+    
+    async def areview_code(
+        self,
+        file_contents: List[Dict[str, Any]],
+        max_concurrency: int = MAX_CONCURRENT_REVIEWS
+    ) -> Dict[str, Any]:
+        """
+        Review each file in its own request, issuing the requests concurrently
+        
+        Args:
+            file_contents: List of dictionaries containing file info and content
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Dictionary with success status, merged review content, and metadata
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with httpx.AsyncClient(headers=self.headers, timeout=60, http2=HTTP2_AVAILABLE) as client:
+            results = await asyncio.gather(
+                *(self.areview_file(client, file_info, semaphore) for file_info in file_contents)
+            )
+        return self._merge_reviews(file_contents, results)
+    
+    def review_code_parallel(
+        self,
+        file_contents: List[Dict[str, Any]],
+        max_concurrency: int = MAX_CONCURRENT_REVIEWS
+    ) -> Dict[str, Any]:
+        """
+        Synchronous entry point for per-file concurrent reviews
+        
+        Args:
+            file_contents: List of dictionaries containing file info and content
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Dictionary with success status, merged review content, and metadata
+        """
+        return asyncio.run(self.areview_code(file_contents, max_concurrency))
+    
+    def cache_key(self, file_contents: List[Dict[str, Any]]) -> str:
+        """
+        Fingerprint a submission so an identical re-upload can reuse its review
+        
+        Args:
+            file_contents: List of dictionaries containing file info and content
+            
+        Returns:
+            SHA-256 hex digest over the model and each file's name and content
+        """
+        digest = hashlib.sha256(self.model.encode("utf-8"))
+        for file_info in file_contents:
+            for part in (file_info['name'], file_info['content']):
+                digest.update(b"\0")
+                digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _build_payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        """Build the chat completion request payload for a prompt"""
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 4000,
+            "stream": stream
+        }
+    
+    def _parse_completion(
+        self, response_data: Dict[str, Any], file_contents: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Turn a chat completion response into a review result"""
+        if 'choices' not in response_data or not response_data['choices']:
+            return {
+                'success': False,
+                'error': 'No response from LLM',
+                'review': None,
+                'metadata': {}
+            }
+        
+        # Extract the review content
+        review_content = response_data['choices'][0]['message']['content']
+        
+        return {
+            'success': True,
+            'review': review_content,
+            'metadata': self._build_metadata(file_contents, response_data.get('usage', {})),
+            'error': None
+        }
+    
+    def _build_metadata(
+        self, file_contents: List[Dict[str, Any]], usage: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Review metadata for a completion with the given token usage"""
+        return {
+            'model_used': self.model,
+            'timestamp': datetime.now().isoformat(),
+            'files_reviewed': len(file_contents),
+            'file_names': [f['name'] for f in file_contents],
+            'total_tokens': usage.get('total_tokens', 0),
+            'prompt_tokens': usage.get('prompt_tokens', 0),
+            'completion_tokens': usage.get('completion_tokens', 0)
+        }
+    
+    def _merge_reviews(
+        self, file_contents: List[Dict[str, Any]], results: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Merge per-file review results into a single review
+        
+        Args:
+            file_contents: File dictionaries in upload order
+            results: Review results in the same order as file_contents
+            
+        Returns:
+            Combined result; fails only if every file failed
+        """
+        if len(results) == 1:
+            return results[0]
+        
+        succeeded = [r for r in results if r['success']]
+        if not succeeded:
+            return {
+                'success': False,
+                'error': results[0]['error'],
+                'review': None,
+                'metadata': {}
+            }
+        
+        sections = []
+        failed_files = []
+        for file_info, result in zip(file_contents, results):
+            if result['success']:
+                body = result['review']
+            else:
+                body = f"_Review failed: {result['error']}_"
+                failed_files.append(file_info['name'])
+            sections.append(f"## File: {file_info['name']}\n\n{body}")
+        
+        metadata = {
+            'model_used': self.model,
+            'timestamp': datetime.now().isoformat(),
+            'files_reviewed': len(file_contents),
+            'file_names': [f['name'] for f in file_contents],
+            'failed_files': failed_files
+        }
+        for key in ('total_tokens', 'prompt_tokens', 'completion_tokens'):
+            metadata[key] = sum(r['metadata'].get(key, 0) for r in succeeded)
+        
+        return {
+            'success': True,
+            'review': "\n\n".join(sections),
+            'metadata': metadata,
+            'error': None
+        }
+    
     def _build_review_prompt(self, file_contents: List[Dict[str, Any]]) -> str:
         """
         Build a comprehensive prompt for code review
@@ -145,51 +454,14 @@ class CodeReviewLLM:
         Returns:
             Formatted prompt string
         """
-        prompt_parts = [
-            "You are an expert code reviewer. Please analyze the following code files and provide a comprehensive review.",
-            "",
-            "**Review Requirements:**",
-            "1. **Code Quality & Readability**: Assess code clarity, naming conventions, and structure",
-            "2. **Modularity & Architecture**: Evaluate code organization, separation of concerns, and reusability",
-            "3. **Potential Bugs**: Identify logical errors, edge cases, and potential runtime issues",
-            "4. **Security Issues**: Look for vulnerabilities, input validation, and security best practices",
-            "5. **Performance**: Comment on efficiency, optimization opportunities, and resource usage",
-            "6. **Best Practices**: Suggest improvements based on language-specific conventions",
-            "7. **Suggestions**: Provide actionable recommendations for improvement",
-            "",
-            "**Response Format:**",
-            "Please structure your response using clear markdown sections with headers:",
-            "- ## Code Quality & Readability",
-            "- ## Modularity & Architecture", 
-            "- ## Potential Bugs",
-            "- ## Security Issues",
-            "- ## Performance Analysis",
-            "- ## Best Practices",
-            "- ## Improvement Suggestions",
-            "",
-            "**Code Files to Review:**",
-            ""
-        ]
-        
-        # Add each file's content
-        for i, file_info in enumerate(file_contents, 1):
-            prompt_parts.extend([
-                f"### File {i}: {file_info['name']}",
-                f"**Size:** {file_info['size']} bytes",
-                f"**Type:** {file_info['type']}",
-                "",
-                "```",
-                file_info['content'],
-                "```",
-                ""
-            ])
-        
-        prompt_parts.extend([
-            "",
-            "Please provide a thorough analysis following the format above. Be specific and actionable in your recommendations."
-        ])
-        
-        return "\n".join(prompt_parts)
+        files = "\n".join(
+            f"### File {i}: {file_info['name']}\n"
+            f"**Size:** {file_info['size']} bytes\n"
+            f"**Type:** {file_info['type']}\n"
+            f"\n```\n{file_info['content']}\n```\n"
+            for i, file_info in enumerate(file_contents, 1)
+        )
+        return f"{_PROMPT_HEADER}\n{files}\n\n{_PROMPT_FOOTER}"
     
     def test_connection(self) -> Dict[str, Any]:
         """
@@ -211,15 +483,10 @@ class CodeReviewLLM:
                 "max_tokens": 10
             }
             
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                data=json.dumps(test_payload),
-                timeout=30
-            )
+            response = self.session.post(self.chat_url, data=_json_dumps(test_payload), timeout=30)
             
             response.raise_for_status()
-            response_data = response.json()
+            response_data = _json_loads(response.content)
             
             if 'choices' in response_data and response_data['choices']:
                 return {
@@ -4,60 +4,139 @@ Handles generation of PDF reports from markdown content
 """
 
 import os
+import copy
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import re
-from io import BytesIO
+import threading
+from io import BytesIO, StringIO
 import matplotlib.pyplot as plt
 from zoneinfo import ZoneInfo 
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import (
-    SimpleDocTemplate,
+    BaseDocTemplate,
+    Frame,
+    PageTemplate,
     Paragraph,
     Spacer,
     Table,
     TableStyle,
     PageBreak,
     Image,
+    Preformatted,
+    ListFlowable,
+    ListItem,
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER
-import markdown
-from markdown.extensions import codehilite, fenced_code
+
+# Timezone used for report timestamps
+REPORT_TZ = ZoneInfo("Asia/Kolkata")
+
+# Page margins in points
+PAGE_MARGINS = {"leftMargin": 72, "rightMargin": 72, "topMargin": 72, "bottomMargin": 18}
+
+# Precompiled markdown patterns used on every report
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_LINE_CLASS_RE = re.compile(r"(###|##|[-*] )")
+
+# Courier 9pt characters that fit between the CodeStyle indents on A4
+CODE_LINE_WIDTH = 75
+
+# Indent of bullet list text from the left margin
+BULLET_INDENT = 12
+
+# Portion of each file shown in the code section
+MAX_CODE_CHARS = 2000
+MAX_CODE_LINES = 50
 
 
 class PDFGenerator:
     """Service for generating PDF reports from code review content"""
 
-    def __init__(self, reports_dir: str = "reports"):
+    # Stylesheet shared by every instance, built on first use
+    _SHARED_STYLES = None
+    _STYLES_LOCK = threading.Lock()
+
+    # Styling for the report information table, identical for every report
+    _METADATA_TABLE_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey),
+            ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+            ("FONTSIZE", (0, 0), (-1, -1), 10),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 12),
+            ("BACKGROUND", (0, 0), (0, -1), colors.grey),
+            ("TEXTCOLOR", (0, 0), (0, -1), colors.whitesmoke),
+        ]
+    )
+    _METADATA_LABELS = ("Generated", "Files Reviewed", "Model Used", "Total Tokens")
+
+    def __init__(self, reports_dir: str = "reports", render_cache_size: int = 0):
         """
         Initialize PDF generator
 
         Args:
             reports_dir: Directory to store generated PDF files
+            render_cache_size: Number of rendered reviews to keep for reuse
+                (0 disables the cache)
         """
         self.reports_dir = reports_dir
         self._ensure_reports_dir()
 
         # Initialize styles
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = self._get_styles()
+
+        # Rendered review flowables keyed by content hash
+        self.render_cache_size = render_cache_size
+        self._render_cache = OrderedDict()
+        self._render_cache_lock = threading.Lock()
+
+        # Styled metadata table that each report copies and fills in, so the
+        # style commands are only applied once
+        self._metadata_table_proto = Table(
+            [[label, ""] for label in self._METADATA_LABELS], colWidths=[2 * inch, 3 * inch]
+        )
+        self._metadata_table_proto.setStyle(self._METADATA_TABLE_STYLE)
+
+        # Frames keep layout state while a document builds, so every thread
+        # gets its own reusable page templates
+        self._templates = threading.local()
 
     def _ensure_reports_dir(self):
         """Ensure reports directory exists"""
         if not os.path.exists(self.reports_dir):
             os.makedirs(self.reports_dir)
 
-    def _setup_custom_styles(self):
+    @classmethod
+    def _get_styles(cls):
+        """Return the shared stylesheet, building it once per process"""
+        if cls._SHARED_STYLES is None:
+            with cls._STYLES_LOCK:
+                if cls._SHARED_STYLES is None:
+                    styles = getSampleStyleSheet()
+                    cls._setup_custom_styles(styles)
+                    cls._SHARED_STYLES = styles
+        return cls._SHARED_STYLES
+
+    @staticmethod
+    def _setup_custom_styles(styles):
         """Setup custom paragraph styles for the PDF"""
         # Title style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CustomTitle",
-                parent=self.styles["Title"],
+                parent=styles["Title"],
                 fontSize=24,
                 spaceAfter=30,
                 alignment=TA_CENTER,
@@ -66,10 +145,10 @@ class PDFGenerator:
         )
 
         # Heading styles
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CustomHeading1",
-                parent=self.styles["Heading1"],
+                parent=styles["Heading1"],
                 fontSize=16,
                 spaceAfter=12,
                 spaceBefore=12,
@@ -80,10 +159,10 @@ class PDFGenerator:
             )
         )
 
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CustomHeading2",
-                parent=self.styles["Heading2"],
+                parent=styles["Heading2"],
                 fontSize=14,
                 spaceAfter=8,
                 spaceBefore=8,
@@ -92,10 +171,10 @@ class PDFGenerator:
         )
 
         # Code style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CodeStyle",
-                parent=self.styles["Normal"],
+                parent=styles["Normal"],
                 fontSize=9,
                 fontName="Courier",
                 leftIndent=20,
@@ -110,10 +189,10 @@ class PDFGenerator:
         )
 
         # Inline code style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="CodeInline",
-                parent=self.styles["Normal"],
+                parent=styles["Normal"],
                 fontName="Courier",
                 fontSize=9,
                 backColor=colors.whitesmoke,
@@ -122,10 +201,10 @@ class PDFGenerator:
         )
 
         # Metadata style
-        self.styles.add(
+        styles.add(
             ParagraphStyle(
                 name="MetadataStyle",
-                parent=self.styles["Normal"],
+                parent=styles["Normal"],
                 fontSize=10,
                 textColor=colors.darkgrey,
                 alignment=TA_CENTER,
@@ -141,14 +220,13 @@ class PDFGenerator:
         ReportLab-compatible HTML formatting.
         """
         # Handle **bold**
-        text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+        text = _BOLD_RE.sub(r"<b>\1</b>", text)
 
         # Handle *italic* (avoiding bold overlap)
-        text = re.sub(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", r"<i>\1</i>", text)
+        text = _ITALIC_RE.sub(r"<i>\1</i>", text)
 
         # Handle inline code using backticks
-        text = re.sub(
-            r"`([^`]+)`",
+        text = _INLINE_CODE_RE.sub(
             r"<font name='Courier' backColor='#f2f2f2' color='black'>\1</font>",
             text,
         )
@@ -187,21 +265,40 @@ class PDFGenerator:
     # 🧾 PDF Generation
     # -------------------------------------------------------------------------
     def generate_report(
-        self, file_contents: List[Dict[str, Any]], review_content: str, metadata: Dict[str, Any]
+        self,
+        file_contents: List[Dict[str, Any]],
+        review_content: str,
+        metadata: Dict[str, Any],
+        filename: Optional[str] = None,
+        precomputed_story: Optional[List] = None,
     ) -> str:
-        """Generate a PDF report from code review content"""
+        """
+        Generate a PDF report from code review content
+
+        Args:
+            file_contents: Reviewed files with name, size, type and content
+            review_content: Review markdown
+            metadata: Review metadata (model_used, total_tokens)
+            filename: PDF file name inside reports_dir (timestamped by default)
+            precomputed_story: Review flowables from IncrementalReviewRenderer,
+                used instead of rendering review_content again
+
+        Returns:
+            Path of the generated PDF
+        """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"code_review_report_{timestamp}.pdf"
+            generated_at = datetime.now(REPORT_TZ)
+            if filename is None:
+                timestamp = generated_at.astimezone().strftime("%Y%m%d_%H%M%S")
+                filename = f"code_review_report_{timestamp}.pdf"
             filepath = os.path.join(self.reports_dir, filename)
 
-            doc = SimpleDocTemplate(
-                filepath,
+            buffer = BytesIO()
+            doc = BaseDocTemplate(
+                buffer,
                 pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18,
+                pageTemplates=self._page_templates(),
+                **PAGE_MARGINS,
             )
 
             story = []
@@ -211,53 +308,109 @@ class PDFGenerator:
             story.append(Spacer(1, 20))
 
             # Metadata
-            story.extend(self._add_metadata_section(metadata, file_contents))
+            story.extend(self._add_metadata_section(metadata, file_contents, generated_at))
             story.append(Spacer(1, 20))
 
             # File contents
             story.extend(self._add_file_contents_section(file_contents))
             story.append(PageBreak())
 
-            # Clean markdown text before parsing
-            review_content = self._clean_markdown_bold(review_content)
-            story.extend(self._parse_markdown_content(review_content))
+            if precomputed_story is not None:
+                story.extend(precomputed_story)
+            else:
+                story.extend(self._render_review(review_content))
 
             doc.build(story)
+
+            # Write the finished document to a temporary file and move it into place, so a
+            # failed write never leaves a truncated PDF under the report's name
+            tmp_path = f"{filepath}.{os.urandom(4).hex()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(buffer.getbuffer())
+                os.replace(tmp_path, filepath)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             return filepath
 
         except Exception as e:
             raise Exception(f"Failed to generate PDF report: {str(e)}")
 
+    def _page_templates(self) -> List[PageTemplate]:
+        """Return this thread's page templates, building them on first use"""
+        templates = getattr(self._templates, "value", None)
+        if templates is None:
+            page_width, page_height = A4
+            frame = Frame(
+                PAGE_MARGINS["leftMargin"],
+                PAGE_MARGINS["bottomMargin"],
+                page_width - PAGE_MARGINS["leftMargin"] - PAGE_MARGINS["rightMargin"],
+                page_height - PAGE_MARGINS["topMargin"] - PAGE_MARGINS["bottomMargin"],
+                id="normal",
+            )
+            templates = [PageTemplate(id="main", frames=[frame], pagesize=A4)]
+            self._templates.value = templates
+        return templates
+
+    def generate_reports_batch(
+        self, jobs: List[Tuple[List[Dict[str, Any]], str, Dict[str, Any]]]
+    ) -> List[str]:
+        """
+        Generate several PDF reports in parallel worker processes
+
+        Args:
+            jobs: (file_contents, review_content, metadata) tuples
+
+        Returns:
+            Paths of the generated PDFs, in the same order as jobs
+        """
+        if not jobs:
+            return []
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        named_jobs = [
+            (job, f"code_review_report_{timestamp}_{i + 1}.pdf")
+            for i, job in enumerate(jobs)
+        ]
+
+        try:
+            max_workers = min(len(jobs), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return list(
+                    executor.map(
+                        _build_one,
+                        [job for job, _ in named_jobs],
+                        [self.reports_dir] * len(jobs),
+                        [filename for _, filename in named_jobs],
+                    )
+                )
+        except Exception as e:
+            raise Exception(f"Failed to generate PDF reports: {str(e)}")
+
     # -------------------------------------------------------------------------
     # 📄 Metadata Section
     # -------------------------------------------------------------------------
     def _add_metadata_section(
-        self, metadata: Dict[str, Any], file_contents: List[Dict[str, Any]]
+        self,
+        metadata: Dict[str, Any],
+        file_contents: List[Dict[str, Any]],
+        generated_at: datetime,
     ) -> List:
         story = []
-        metadata_data = [
-            ["Generated", datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")],
-            ["Files Reviewed", str(len(file_contents))],
-            ["Model Used", metadata.get("model_used", "N/A")],
-            ["Total Tokens", str(metadata.get("total_tokens", "N/A"))],
-        ]
-
-        metadata_table = Table(metadata_data, colWidths=[2 * inch, 3 * inch])
-        metadata_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 12),
-                    ("BACKGROUND", (0, 0), (0, -1), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (0, -1), colors.whitesmoke),
-                ]
-            )
+        values = (
+            generated_at.strftime("%Y-%m-%d %H:%M:%S"),
+            str(len(file_contents)),
+            metadata.get("model_used", "N/A"),
+            str(metadata.get("total_tokens", "N/A")),
         )
 
+        # The prototype is never laid out itself, so a shallow copy with fresh
+        # cell values is independent of it
+        metadata_table = copy.copy(self._metadata_table_proto)
+        metadata_table._cellvalues = [list(row) for row in zip(self._METADATA_LABELS, values)]
+
         story.append(Paragraph("Report Information", self.styles["CustomHeading1"]))
         story.append(metadata_table)
         story.append(Spacer(1, 12))
@@ -268,118 +421,154 @@ class PDFGenerator:
     # -------------------------------------------------------------------------
     def _add_file_contents_section(self, file_contents: List[Dict[str, Any]]) -> List:
         story = []
-        story.append(Paragraph("Code Files Reviewed", self.styles["CustomHeading1"]))
+        append = story.append
+        heading2_style = self.styles["CustomHeading2"]
+        metadata_style = self.styles["MetadataStyle"]
+        code_style = self.styles["CodeStyle"]
+
+        append(Paragraph("Code Files Reviewed", self.styles["CustomHeading1"]))
 
         for i, file_info in enumerate(file_contents, 1):
-            story.append(Paragraph(f"File {i}: {file_info['name']}", self.styles["CustomHeading2"]))
+            name = file_info["name"]
+            append(Paragraph(f"File {i}: {name}", heading2_style))
             metadata_text = f"Size: {file_info['size']:,} bytes | Type: {file_info['type']}"
-            story.append(Paragraph(metadata_text, self.styles["MetadataStyle"]))
-            story.append(Spacer(1, 6))
-
-            content = file_info["content"]
-            if len(content) > 2000:
-                content = content[:2000] + "\n\n... [Content truncated for PDF display] ..."
-
-            lines = content.split("\n")
-            for line in lines[:50]:
-                if line.strip():
-                    story.append(Paragraph(line, self.styles["CodeStyle"]))
-                else:
-                    story.append(Spacer(1, 6))
-
-            if len(lines) > 50:
-                story.append(Paragraph("... [Additional lines truncated] ...", self.styles["CodeStyle"]))
-            story.append(Spacer(1, 12))
-
-            story.append(Paragraph(f"Complexity Graph for {file_info['name']}", self.styles["CustomHeading2"]))
-            graph_img = self.generate_complexity_graph(file_info["name"])
-            story.append(Image(graph_img, width=400, height=300))
-            story.append(Spacer(1, 20))
+            append(Paragraph(metadata_text, metadata_style))
+            append(Spacer(1, 6))
+
+            excerpt, more_lines = _code_excerpt(file_info["content"])
+            append(
+                Preformatted(
+                    excerpt,
+                    code_style,
+                    maxLineLength=CODE_LINE_WIDTH,
+                    newLineChars="",
+                )
+            )
+
+            if more_lines:
+                append(Paragraph("... [Additional lines truncated] ...", code_style))
+            append(Spacer(1, 12))
+
+            append(Paragraph(f"Complexity Graph for {name}", heading2_style))
+            graph_img = self.generate_complexity_graph(name)
+            append(Image(graph_img, width=400, height=300))
+            append(Spacer(1, 20))
 
         return story
 
     # -------------------------------------------------------------------------
     # 🧩 Markdown Parsing Section
     # -------------------------------------------------------------------------
-    def _parse_markdown_content(self, markdown_content: str) -> List:
-        story = []
-        html = markdown.markdown(
-            markdown_content, extensions=["codehilite", "fenced_code", "tables"]
-        )
-        sections = self._split_by_headers(markdown_content)
-        for section in sections:
-            if section.strip():
-                story.extend(self._process_section(section))
-        return story
-
-    def _split_by_headers(self, content: str) -> List[str]:
-        sections = re.split(r"\n(#{2,3})\s+", content)
-        result = []
-        for i in range(0, len(sections), 2):
-            if i + 1 < len(sections):
-                header = sections[i].strip()
-                content_part = sections[i + 1].strip() if i + 1 < len(sections) else ""
-                if header and content_part:
-                    result.append(f"{header}\n{content_part}")
-            elif sections[i].strip():
-                result.append(sections[i].strip())
-        return result
-
-    def _process_section(self, section: str) -> List:
-        story = []
-        lines = section.split("\n")
-        current_paragraph = []
-
+    def _render_review(self, review_content: str) -> List:
+        """Render review markdown to flowables, reusing cached parses if enabled"""
+        if not self.render_cache_size:
+            return self._build_flowables(self._parse_review_blocks(review_content))
+
+        # Flowables carry layout state from the build that used them, so only the
+        # parsed blocks are cached and fresh flowables are made for every report
+        key = hashlib.blake2b(review_content.encode("utf-8"), digest_size=16).hexdigest()
+        with self._render_cache_lock:
+            blocks = self._render_cache.get(key)
+            if blocks is not None:
+                self._render_cache.move_to_end(key)
+
+        if blocks is None:
+            blocks = tuple(self._parse_review_blocks(review_content))
+            with self._render_cache_lock:
+                self._render_cache[key] = blocks
+                while len(self._render_cache) > self.render_cache_size:
+                    self._render_cache.popitem(last=False)
+        return self._build_flowables(blocks)
+
+    def _parse_review_blocks(self, markdown_content: str) -> List[Tuple[str, Any]]:
+        """Classify review markdown into (kind, cleaned text) blocks in a single pass"""
+        blocks = []
+        current_paragraph = StringIO()
+        current_list = []
+        lines, _ = _split_review_lines(markdown_content, final=True)
         for line in lines:
-            line = line.strip()
+            self._render_line(line, blocks, current_paragraph, current_list)
+        self._flush_blocks(blocks, current_paragraph, current_list)
+        return blocks
+
+    def _render_line(
+        self, line: str, blocks: List, current_paragraph: StringIO, current_list: List[str]
+    ):
+        """Append the blocks for one markdown line, buffering paragraph and list text"""
+        line = line.strip()
+
+        if not line:
+            self._flush_blocks(blocks, current_paragraph, current_list)
+            blocks.append(("spacer", 6))
+            return
+
+        match = _LINE_CLASS_RE.match(line)
+        if match is None:
+            self._flush_list(blocks, current_list)
+            if current_paragraph.tell():
+                current_paragraph.write(" ")
+            current_paragraph.write(line)
+            return
+
+        marker = match.group(1)
+        if marker not in ("###", "##"):
+            self._flush_paragraph(blocks, current_paragraph)
+            current_list.append(line[2:].strip())
+            return
+
+        self._flush_blocks(blocks, current_paragraph, current_list)
+        header_text = self._clean_markdown_bold(line.replace("#", "").strip())
+        if marker == "###":
+            blocks.append(("heading2", header_text))
+            blocks.append(("spacer", 4))
+        else:
+            blocks.append(("heading1", header_text))
+            blocks.append(("spacer", 6))
+
+    def _flush_blocks(self, blocks: List, current_paragraph: StringIO, current_list: List[str]):
+        """Emit whichever paragraph or list is still buffered"""
+        self._flush_paragraph(blocks, current_paragraph)
+        self._flush_list(blocks, current_list)
+
+    def _flush_paragraph(self, blocks: List, current_paragraph: StringIO):
+        """Emit the buffered paragraph lines as one paragraph block"""
+        if current_paragraph.tell():
+            blocks.append(("paragraph", self._clean_markdown_bold(current_paragraph.getvalue())))
+            # Rewind rather than reallocate so the buffer is reused for the next paragraph
+            current_paragraph.seek(0)
+            current_paragraph.truncate()
+
+    def _flush_list(self, blocks: List, current_list: List[str]):
+        """Emit consecutive bullet lines as one list block"""
+        if current_list:
+            blocks.append(("list", tuple(self._clean_markdown_bold(item) for item in current_list)))
+            current_list.clear()
+
+    def _build_flowables(self, blocks) -> List:
+        """Create new flowables for parsed review blocks"""
+        normal_style = self.styles["Normal"]
+        heading_styles = {
+            "heading1": self.styles["CustomHeading1"],
+            "heading2": self.styles["CustomHeading2"],
+        }
 
-            if not line:
-                if current_paragraph:
-                    story.append(
-                        Paragraph(self._clean_markdown_bold(" ".join(current_paragraph)), self.styles["Normal"])
-                    )
-                    current_paragraph = []
-                story.append(Spacer(1, 6))
-                continue
-
-            if line.startswith("##"):
-                if current_paragraph:
-                    story.append(
-                        Paragraph(self._clean_markdown_bold(" ".join(current_paragraph)), self.styles["Normal"])
-                    )
-                    current_paragraph = []
-                header_text = line.replace("#", "").strip()
-                story.append(Paragraph(header_text, self.styles["CustomHeading1"]))
-                story.append(Spacer(1, 6))
-
-            elif line.startswith("###"):
-                if current_paragraph:
-                    story.append(
-                        Paragraph(self._clean_markdown_bold(" ".join(current_paragraph)), self.styles["Normal"])
-                    )
-                    current_paragraph = []
-                header_text = line.replace("#", "").strip()
-                story.append(Paragraph(header_text, self.styles["CustomHeading2"]))
-                story.append(Spacer(1, 4))
-
-            elif line.startswith("- ") or line.startswith("* "):
-                if current_paragraph:
-                    story.append(
-                        Paragraph(self._clean_markdown_bold(" ".join(current_paragraph)), self.styles["Normal"])
-                    )
-                    current_paragraph = []
-                bullet_text = line[2:].strip()
+        story = []
+        for kind, value in blocks:
+            if kind == "spacer":
+                story.append(Spacer(1, value))
+            elif kind == "paragraph":
+                story.append(Paragraph(value, normal_style))
+            elif kind == "list":
                 story.append(
-                    Paragraph(f"• {self._clean_markdown_bold(bullet_text)}", self.styles["Normal"])
+                    ListFlowable(
+                        [ListItem(Paragraph(item, normal_style)) for item in value],
+                        bulletType="bullet",
+                        leftIndent=BULLET_INDENT,
+                        bulletFontSize=normal_style.fontSize,
+                    )
                 )
-
             else:
-                current_paragraph.append(line)
-
-        if current_paragraph:
-            story.append(
-                Paragraph(self._clean_markdown_bold(" ".join(current_paragraph)), self.styles["Normal"])
-            )
+                story.append(Paragraph(value, heading_styles[kind]))
         return story
 
     # -------------------------------------------------------------------------
@@ -388,15 +577,111 @@ class PDFGenerator:
     def get_report_info(self, filepath: str) -> Dict[str, Any]:
         """Get information about a generated report"""
         try:
-            if not os.path.exists(filepath):
-                return {"exists": False}
-
             stat = os.stat(filepath)
-            return {
-                "exists": True,
-                "size": stat.st_size,
-                "created": datetime.fromtimestamp(stat.st_ctime , ZoneInfo("Asia/Kolkata")).isoformat(),
-                "modified": datetime.fromtimestamp(stat.st_mtime, ZoneInfo("Asia/Kolkata")).isoformat(),
-            }
+        except (FileNotFoundError, NotADirectoryError):
+            return {"exists": False}
         except Exception as e:
             return {"exists": False, "error": str(e)}
+
+        return dict(_stat_info(stat.st_size, stat.st_ctime, stat.st_mtime))
+
+
+class IncrementalReviewRenderer:
+    """
+    Builds review flowables while the review is still streaming in
+
+    Each line is parsed as soon as its line break arrives, so the full review
+    never has to be parsed again once it is complete.
+    """
+
+    def __init__(self, pdf_generator: PDFGenerator):
+        """
+        Initialize the renderer
+
+        Args:
+            pdf_generator: Generator whose styles and markdown rules are used
+        """
+        self.pdf_generator = pdf_generator
+        self.blocks = []
+        self._current_paragraph = StringIO()
+        self._current_list = []
+        self._pending = ""
+
+    def feed(self, chunk: str):
+        """Add streamed review text, parsing every line it completes"""
+        lines, self._pending = _split_review_lines(self._pending + chunk)
+        for line in lines:
+            self.pdf_generator._render_line(
+                line, self.blocks, self._current_paragraph, self._current_list
+            )
+
+    def finalize(self) -> List:
+        """Render any trailing partial line and return the finished flowables"""
+        lines, self._pending = _split_review_lines(self._pending, final=True)
+        for line in lines:
+            self.pdf_generator._render_line(
+                line, self.blocks, self._current_paragraph, self._current_list
+            )
+        self.pdf_generator._flush_blocks(self.blocks, self._current_paragraph, self._current_list)
+        return self.pdf_generator._build_flowables(self.blocks)
+
+
+@lru_cache(maxsize=1024)
+def _stat_info(size: int, ctime: float, mtime: float) -> Dict[str, Any]:
+    """Format report file info; cached so unchanged files skip the datetime work"""
+    return {
+        "exists": True,
+        "size": size,
+        "created": datetime.fromtimestamp(ctime, REPORT_TZ).isoformat(),
+        "modified": datetime.fromtimestamp(mtime, REPORT_TZ).isoformat(),
+    }
+
+
+def _build_one(
+    job: Tuple[List[Dict[str, Any]], str, Dict[str, Any]], reports_dir: str, filename: str
+) -> str:
+    """Build a single report inside a worker process"""
+    file_contents, review_content, metadata = job
+    return PDFGenerator(reports_dir).generate_report(
+        file_contents, review_content, metadata, filename=filename
+    )
+
+
+def _code_excerpt(content: str) -> Tuple[str, bool]:
+    """
+    Cut the displayed head out of a file without splitting the whole content
+
+    Returns:
+        The excerpt text and whether lines beyond MAX_CODE_LINES were dropped
+    """
+    window = content[:MAX_CODE_CHARS]
+    if len(content) > MAX_CODE_CHARS:
+        # The note counts toward the line limit, as it is part of the displayed text
+        window += "\n\n... [Content truncated for PDF display] ..."
+
+    end = -1
+    for _ in range(MAX_CODE_LINES):
+        end = window.find("\n", end + 1)
+        if end == -1:
+            return window, False
+    return window[:end], True
+
+
+def _split_review_lines(text: str, final: bool = False) -> Tuple[List[str], str]:
+    """
+    Split review text into lines on the same breaks as str.splitlines
+
+    Args:
+        final: Whether the text is complete; if not, an unterminated last line (or one
+            ending in a carriage return, whose line feed may be in the next chunk) is held back
+
+    Returns:
+        The complete lines without their line breaks, and the held-back remainder
+    """
+    lines = text.splitlines(keepends=True)
+    remainder = ""
+    if not final and lines:
+        last = lines[-1]
+        if last.endswith("\r") or last.splitlines()[0] == last:
+            remainder = lines.pop()
+    return [line.splitlines()[0] for line in lines], remainder
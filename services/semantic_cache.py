@@ -0,0 +1,91 @@
+"""
+Semantic Review Cache for Code Review Assistant
+Reuses the stored review of near-duplicate code using sentence embeddings
+"""
+
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+# Optional: the cache is disabled when sentence-transformers is not installed
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+class SemanticReviewCache:
+    """Finds a previously reviewed submission whose code is nearly identical"""
+
+    def __init__(self, db_manager, model_name: Optional[str] = None, threshold: Optional[float] = None):
+        """
+        Initialize the semantic cache
+
+        Args:
+            db_manager: DatabaseManager holding the stored embeddings
+            model_name: Sentence-transformers model used to embed code
+            threshold: Minimum cosine similarity for a cached review to be reused
+        """
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is required for the semantic review cache")
+
+        self.db_manager = db_manager
+        self.model_name = model_name or os.getenv(
+            "SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+        )
+        self.threshold = threshold if threshold is not None else float(
+            os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")
+        )
+        self.model = SentenceTransformer(self.model_name)
+
+    def embed(self, file_contents: List[Dict[str, Any]]) -> bytes:
+        """
+        Embed a submission for storage alongside its report
+
+        Args:
+            file_contents: List of dictionaries containing file info and content
+
+        Returns:
+            Unit-length embedding as float16 bytes (half the storage of float32)
+        """
+        text = "\n\n".join(f"{f['name']}\n{f['content']}" for f in file_contents)
+        vector = self.model.encode(text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float16).tobytes()
+
+    def find_similar(self, embedding: bytes, model_used: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the stored review closest to an embedding
+
+        Args:
+            embedding: Embedding returned by embed()
+            model_used: LLM model the reused review must come from
+
+        Returns:
+            Dictionary with review_content, metadata and similarity, or None below threshold
+        """
+        query = np.frombuffer(embedding, dtype=np.float16).astype(np.float32)
+        candidates = [
+            row for row in self.db_manager.get_review_embeddings(model_used)
+            if len(row["embedding"]) == len(embedding)
+        ]
+        if not candidates:
+            return None
+
+        # Vectors are unit length, so the dot product is the cosine similarity
+        matrix = np.frombuffer(
+            b"".join(row["embedding"] for row in candidates), dtype=np.float16
+        ).reshape(len(candidates), -1)
+        scores = matrix.astype(np.float32) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        report = self.db_manager.get_report(candidates[best]["id"])
+        if not report:
+            return None
+        return {
+            "review_content": report["review_content"],
+            "metadata": report["metadata"],
+            "similarity": float(scores[best]),
+        }
@@ -3,48 +3,32 @@ Test script for Code Review Assistant
 Verifies that all components are working correctly
 """
 
+import importlib.util
 import os
+import shutil
 import sys
 from datetime import datetime
 
+def _list_entries():
+    """Names in the current directory, read with one directory scan"""
+    with os.scandir('.') as entries:
+        return {entry.name for entry in entries}
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("🔍 Testing imports...")
     
-    try:
-        import streamlit as st
-        print("✅ Streamlit imported successfully")
-    except ImportError as e:
-        print(f"❌ Streamlit import failed: {e}")
-        return False
-    
-    try:
-        import requests
-        print("✅ Requests imported successfully")
-    except ImportError as e:
-        print(f"❌ Requests import failed: {e}")
-        return False
-    
-    try:
-        import reportlab
-        print("✅ ReportLab imported successfully")
-    except ImportError as e:
-        print(f"❌ ReportLab import failed: {e}")
-        return False
-    
-    try:
-        import markdown
-        print("✅ Markdown imported successfully")
-    except ImportError as e:
-        print(f"❌ Markdown import failed: {e}")
-        return False
-    
-    try:
-        import sqlite3
-        print("✅ SQLite3 imported successfully")
-    except ImportError as e:
-        print(f"❌ SQLite3 import failed: {e}")
-        return False
+    # find_spec checks availability without running each module's import-time setup
+    for module_name, label in (
+        ("streamlit", "Streamlit"),
+        ("requests", "Requests"),
+        ("reportlab", "ReportLab"),
+        ("sqlite3", "SQLite3"),
+    ):
+        if importlib.util.find_spec(module_name) is None:
+            print(f"❌ {label} not found: No module named '{module_name}'")
+            return False
+        print(f"✅ {label} is available")
     
     return True
 
@@ -53,9 +37,10 @@ def test_directories():
     print("\n📁 Testing directories...")
     
     directories = ['services', 'db', 'reports']
+    present = _list_entries()
     
     for directory in directories:
-        if os.path.exists(directory):
+        if directory in present:
             print(f"✅ Directory '{directory}' exists")
         else:
             try:
@@ -71,26 +56,18 @@ def test_services():
     """Test that service modules can be imported"""
     print("\n🔧 Testing services...")
     
-    try:
-        from services.llm_client import CodeReviewLLM
-        print("✅ LLM Client service imported successfully")
-    except ImportError as e:
-        print(f"❌ LLM Client import failed: {e}")
-        return False
-    
-    try:
-        from services.pdf_generator import PDFGenerator
-        print("✅ PDF Generator service imported successfully")
-    except ImportError as e:
-        print(f"❌ PDF Generator import failed: {e}")
-        return False
-    
-    try:
-        from db.database import DatabaseManager
-        print("✅ Database Manager imported successfully")
-    except ImportError as e:
-        print(f"❌ Database Manager import failed: {e}")
-        return False
+    # Each service module is only imported here, when this test runs
+    for module_name, class_name, label in (
+        ("services.llm_client", "CodeReviewLLM", "LLM Client service"),
+        ("services.pdf_generator", "PDFGenerator", "PDF Generator service"),
+        ("db.database", "DatabaseManager", "Database Manager"),
+    ):
+        try:
+            getattr(importlib.import_module(module_name), class_name)
+            print(f"✅ {label} imported successfully")
+        except (ImportError, AttributeError) as e:
+            print(f"❌ {label} import failed: {e}")
+            return False
     
     return True
 
@@ -100,17 +77,26 @@ def test_database():
     
     try:
         from db.database import DatabaseManager
-        db_manager = DatabaseManager("db/test_reviews.db")
+        db_manager = DatabaseManager("db/test_reviews.db", reviews_dir="db/test_reviews")
         print("✅ Database initialized successfully")
         
         # Test basic operations
         stats = db_manager.get_database_stats()
         print(f"✅ Database stats retrieved: {stats}")
         
-        # Clean up test database
-        if os.path.exists("db/test_reviews.db"):
-            os.remove("db/test_reviews.db")
-            print("✅ Test database cleaned up")
+        # Test that a whitespace-only search counts the rows it lists
+        db_manager.save_report("tester", ["sample.py"], "", "## Review", {"model_used": "test"})
+        count = db_manager.get_reports_count(search_term="   ")
+        assert count == len(db_manager.search_reports("   ")), "search count and results disagree"
+        print(f"✅ Whitespace search consistent: {count} report(s)")
+        db_manager.close()
+        
+        # Clean up test database (plus WAL sidecar files)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(f"db/test_reviews.db{suffix}"):
+                os.remove(f"db/test_reviews.db{suffix}")
+        shutil.rmtree("db/test_reviews", ignore_errors=True)
+        print("✅ Test database cleaned up")
         
         return True
     except Exception as e:
@@ -130,6 +116,27 @@ def test_pdf_generator():
         info = pdf_gen.get_report_info("nonexistent.pdf")
         print(f"✅ PDF Generator methods working: {info}")
         
+        # Test that a cached review renders again (multi-page, so flowables split)
+        cached_gen = PDFGenerator("reports/test", render_cache_size=2)
+        file_contents = [{"name": "sample.py", "size": 9, "type": "py", "content": "print(1)"}]
+        review = "## Review\n" + "\n\n".join(["**Issue** " + "lorem ipsum " * 60] * 40) + "\n- item"
+        for attempt in ("first", "cached"):
+            pdf_path = cached_gen.generate_report(
+                file_contents, review, {"model_used": "test"}, filename=f"cache_{attempt}.pdf"
+            )
+            os.remove(pdf_path)
+        print("✅ Cached review rendered twice successfully")
+        
+        # Test that streamed CRLF text parses like the complete review (chunks split "\r\n")
+        from services.pdf_generator import IncrementalReviewRenderer
+        crlf_review = "## Summary\r\nFirst **line**\r\n\r\n- one\r\n- two\r\n### Done\rlast"
+        renderer = IncrementalReviewRenderer(pdf_gen)
+        for start in range(0, len(crlf_review), 3):
+            renderer.feed(crlf_review[start:start + 3])
+        renderer.finalize()
+        assert renderer.blocks == pdf_gen._parse_review_blocks(crlf_review), "streamed blocks differ"
+        print("✅ Streamed CRLF review matches the full parse")
+        
         return True
     except Exception as e:
         print(f"❌ PDF Generator test failed: {e}")
@@ -139,14 +146,16 @@ def test_environment():
     """Test environment configuration"""
     print("\n🌍 Testing environment...")
     
+    present = _list_entries()
+    
     # Check if .env file exists
-    if os.path.exists('.env'):
+    if '.env' in present:
         print("✅ .env file exists")
     else:
         print("⚠️  .env file not found - please copy env.example to .env")
     
     # Check if env.example exists
-    if os.path.exists('env.example'):
+    if 'env.example' in present:
         print("✅ env.example file exists")
     else:
         print("❌ env.example file missing")
@@ -199,6 +208,8 @@ def main():
         print("3. Ensure Python version is 3.8+")
 
 if __name__ == "__main__":
+    # One-off setup check; skip writing .pyc files for everything it imports
+    sys.dont_write_bytecode = True
     main()
 
 